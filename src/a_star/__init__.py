@@ -1 +1,12 @@
+from a_star.engine import *
+from a_star.heuristics import *
+from a_star.bidirectional import *
+from a_star.jps import *
+from a_star.incremental import *
+from a_star.hierarchical import *
+from a_star.contraction import *
+from a_star.fields import *
+from a_star.modes import *
+from a_star.cache import *
+from a_star.worker import *
 from a_star.path_finder import *
\ No newline at end of file
@@ -0,0 +1,124 @@
+from array import array
+from heapq import heappop, heappush
+from math import inf
+from time import perf_counter
+from typing import Optional
+
+from a_star.engine import ISearchObserver, SearchResult, SearchStats, SearchSteps, neighbor_steps, run_steps, trace_path
+from a_star.heuristics import Heuristic, default_heuristic, get_heuristic, terrain_scaled
+from models import TERRAIN_COSTS, Grid
+
+
+class _Frontier:
+    def __init__(self, grid: Grid, origin: int, target: int, heuristic: Heuristic) -> None:
+        self.origin_x, self.origin_y = grid.coords(origin)
+        self.target_x, self.target_y = grid.coords(target)
+        self.heuristic = heuristic
+        self.best_g = array('d', [inf]) * grid.size
+        self.parents = array('l', [-1]) * grid.size
+        self.closed = bytearray(grid.size)
+        self.counter = 0
+
+        p = self.potential(self.origin_x, self.origin_y)
+        self.best_g[origin] = 0.0
+        self.openlist: list[tuple[float, float, int, int]] = [(p, p, 0, origin)]
+
+    def potential(self, x: int, y: int) -> float:
+        # Average of the forward and reverse estimates; both frontiers then see the same
+        # reduced edge costs, which makes the bidirectional Dijkstra stopping rule valid
+        return (self.heuristic(abs(x - self.target_x), abs(y - self.target_y)) \
+                - self.heuristic(abs(x - self.origin_x), abs(y - self.origin_y))) / 2
+
+    def top(self) -> float:
+        return self.openlist[0][0] if self.openlist else inf
+
+
+def bidirectional_search(grid: Grid, start: int, goal: int, heuristic: Optional[Heuristic] = None, \
+                         diagonals: Optional[bool] = None, observer: Optional[ISearchObserver] = None) -> SearchResult:
+    return run_steps(bidirectional_search_steps(grid, start, goal, heuristic, diagonals, observer))
+
+
+def bidirectional_search_steps(grid: Grid, start: int, goal: int, heuristic: Optional[Heuristic] = None, \
+                               diagonals: Optional[bool] = None, \
+                               observer: Optional[ISearchObserver] = None) -> SearchSteps:
+    if diagonals is None:
+        diagonals = grid.diagonals
+
+    if heuristic is None:
+        heuristic = get_heuristic(default_heuristic(diagonals))
+    heuristic = terrain_scaled(heuristic, grid.min_cost())
+
+    width = grid.width
+    steps = neighbor_steps(grid, diagonals)
+    masks = grid.neighbor_masks()
+    weighted = grid.has_terrain()
+    terrain = grid.terrain
+    stats = SearchStats(pushes=2)
+    began = perf_counter()
+
+    forward = _Frontier(grid, start, goal, heuristic)
+    backward = _Frontier(grid, goal, start, heuristic)
+    best_cost = inf
+    meeting = -1
+
+    while forward.openlist and backward.openlist:
+        if forward.top() + backward.top() >= best_cost:
+            break
+
+        reverse = len(backward.openlist) < len(forward.openlist)
+        frontier, other = (backward, forward) if reverse else (forward, backward)
+
+        stats.peak_open = max(stats.peak_open, len(forward.openlist) + len(backward.openlist))
+        current = heappop(frontier.openlist)[3]
+        stats.pops += 1
+
+        if frontier.closed[current]:
+            stats.stale += 1
+            continue
+
+        frontier.closed[current] = 1
+        g = frontier.best_g[current]
+        if g + other.best_g[current] < best_cost:
+            best_cost = g + other.best_g[current]
+            meeting = current
+
+        stats.expanded += 1
+        if observer:
+            observer.on_expand(current, reverse)
+        yield stats
+
+        y, x = divmod(current, width)
+        weight = TERRAIN_COSTS[terrain[current]] if weighted else 1.0
+        mask = masks[current]
+        for bit, dx, dy, offset, cost in steps:
+            if not mask & bit:
+                continue
+
+            neighbor = current + offset
+            if frontier.closed[neighbor]:
+                continue
+
+            ng = g + (cost * (weight + TERRAIN_COSTS[terrain[neighbor]]) / 2 if weighted else cost)
+            if ng >= frontier.best_g[neighbor]:
+                continue
+
+            frontier.best_g[neighbor] = ng
+            frontier.parents[neighbor] = current
+            if ng + other.best_g[neighbor] < best_cost:
+                best_cost = ng + other.best_g[neighbor]
+                meeting = neighbor
+
+            np = frontier.potential(x + dx, y + dy)
+            frontier.counter += 1
+            heappush(frontier.openlist, (ng + np, np, frontier.counter, neighbor))
+            stats.pushes += 1
+
+    stats.time = perf_counter() - began
+    if meeting < 0:
+        return SearchResult(None, 0.0, stats)
+
+    path = trace_path(forward.parents, start, meeting) \
+        + trace_path(backward.parents, goal, meeting)[-2::-1]
+    if observer:
+        observer.on_path(path)
+    return SearchResult(path, best_cost, stats)
@@ -0,0 +1,110 @@
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from a_star.engine import SearchResult
+from models import ALL_BITS, MASK_DEGREES, ORTHOGONAL_BITS, ConnectedComponents, Grid, IPassabilityListener
+
+type _Key = tuple[int, int, int, str, str, bool]
+
+
+# LRU cache of search results for one grid. Any change to which cells are passable, or to their
+# terrain, bumps the version and drops every entry. On grids without cycles (perfect mazes and
+# forests of them) the path between two cells is unique, so any stretch of a cached path answers a
+# query on its own, whichever mode or heuristic found it. Only paths that never revisit a cell are
+# used that way, as an approximate mode could return a walk with a detour in it.
+class PathCache(IPassabilityListener):
+    def __init__(self, grid: Grid, components: ConnectedComponents, capacity: int = 64) -> None:
+        self.grid = grid
+        self.capacity = capacity
+        self.version = 0
+        self.hits = 0
+        self.subpath_hits = 0
+        self.misses = 0
+        self._components = components
+        self._entries: OrderedDict[_Key, SearchResult] = OrderedDict()
+        self._positions: OrderedDict[_Key, dict[int, int]] = OrderedDict()
+        self._acyclic: Optional[bool] = None
+        grid.add_passability_listener(self)
+
+    def close(self) -> None:
+        self.grid.remove_passability_listener(self)
+
+    def on_passability_change(self, index: int) -> None:
+        self._invalidate()
+
+    def on_passability_reset(self) -> None:
+        self._invalidate()
+
+    def on_cost_change(self, index: int) -> None:
+        self._invalidate()
+
+    def on_cost_reset(self) -> None:
+        self._invalidate()
+
+    # Entries are kept per search mode, as not every mode finds the shortest path; heuristic is any
+    # hashable description of the heuristic, e.g. its name and weight
+    def get(self, start: int, goal: int, mode: str, heuristic: str, diagonals: bool) -> Optional[SearchResult]:
+        key = (self.version, start, goal, mode, heuristic, diagonals)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+        result = self._find_subpath(start, goal, diagonals)
+        if result:
+            self.subpath_hits += 1
+            return result
+
+        self.misses += 1
+        return None
+
+    def put(self, start: int, goal: int, mode: str, heuristic: str, diagonals: bool, result: SearchResult) -> None:
+        key = (self.version, start, goal, mode, heuristic, diagonals)
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.capacity:
+            evicted, _ = self._entries.popitem(last=False)
+            self._positions.pop(evicted, None)
+
+    def _invalidate(self) -> None:
+        self.version += 1
+        self._entries.clear()
+        self._positions.clear()
+        self._acyclic = None
+
+    def _find_subpath(self, start: int, goal: int, diagonals: bool) -> Optional[SearchResult]:
+        if diagonals != self.grid.diagonals or not self._is_acyclic():
+            return None
+
+        for key in reversed(self._entries):
+            path = self._entries[key].path
+            if path is None or key[5] != diagonals:
+                continue
+
+            positions = self._positions.get(key)
+            if positions is None:
+                positions = self._positions[key] = {index: position for position, index in enumerate(path)}
+            if len(positions) < len(path):
+                continue
+
+            if start in positions and goal in positions:
+                a, b = positions[start], positions[goal]
+                subpath = path[a:b + 1] if a <= b else path[b:a + 1][::-1]
+                self._entries.move_to_end(key)
+                return SearchResult(subpath, self.grid.path_cost(subpath))
+
+        return None
+
+    # A graph is a forest exactly when it has one edge fewer than cells per component
+    def _is_acyclic(self) -> bool:
+        if self._acyclic is None:
+            passable = self.grid.passable_mask()
+            masks = np.frombuffer(self.grid.neighbor_masks(), dtype=np.uint8)[passable] \
+                & (ALL_BITS if self.grid.diagonals else ORTHOGONAL_BITS)
+            # Every edge shows in the masks of both its cells
+            edges = int(MASK_DEGREES[masks].sum(dtype=np.int64)) // 2
+            self._acyclic = edges == np.count_nonzero(passable) - self._components.count()
+
+        return self._acyclic
@@ -0,0 +1,344 @@
+from array import array
+from heapq import heappop, heappush
+from math import inf
+from time import perf_counter
+from typing import Optional
+
+import numpy as np
+
+from a_star.engine import ISearchObserver, SearchResult, SearchStats, Step, neighbor_steps
+from a_star.heuristics import Heuristic, default_heuristic, get_heuristic, terrain_scaled
+from models import ALL_BITS, MASK_DEGREES, ORTHOGONAL_BITS, Grid, IPassabilityListener
+
+# Target node, cost, and the stretch of an edge's chain the hop walks: (edge, from position, to position)
+type _Hop = tuple[int, float, int, int, int]
+
+
+# Contracts the grid into a graph of junctions and dead ends whose edges are the corridors between
+# them, weighted by corridor length. Dead-end branches are then stripped leaf by leaf: every stripped
+# node points at the node it hangs off, so a query climbs from both endpoints until they meet or
+# reach the remaining core, and only the core (the cycles) is ever searched. Perfect mazes strip
+# down to nothing and need no search at all. Any change in passability or terrain makes the graph
+# stale and it is rebuilt on the next query.
+class ContractedPlanner(IPassabilityListener):
+    def __init__(self, grid: Grid) -> None:
+        self.grid = grid
+        self._diagonals: Optional[bool] = None
+        self._steps: list[Step] = []
+        # Each edge's chain runs from one node through its corridor cells to the other node
+        self._chains: list[list[int]] = []
+        self._costs: list[array] = []
+        self._adjacent: dict[int, list[_Hop]] = {}
+        self._edge_of = array('l')
+        self._position_of = array('l')
+        # Stripped nodes: the hop towards the node they hang off, and how many hops from the core
+        # (or from the root, for components without cycles) they are
+        self._parent_hops: dict[int, _Hop] = {}
+        self._depths: dict[int, int] = {}
+        self._core: set[int] = set()
+        grid.add_passability_listener(self)
+
+    def close(self) -> None:
+        self.grid.remove_passability_listener(self)
+
+    def on_passability_change(self, index: int) -> None:
+        self._diagonals = None
+
+    def on_passability_reset(self) -> None:
+        self._diagonals = None
+
+    def on_cost_change(self, index: int) -> None:
+        self._diagonals = None
+
+    def on_cost_reset(self) -> None:
+        self._diagonals = None
+
+    @property
+    def node_count(self) -> int:
+        return len(self._adjacent)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self._chains)
+
+    @property
+    def core_size(self) -> int:
+        return len(self._core)
+
+    def __call__(self, grid: Grid, start: int, goal: int, heuristic: Optional[Heuristic] = None, \
+                 diagonals: Optional[bool] = None, observer: Optional[ISearchObserver] = None) -> SearchResult:
+        assert grid is self.grid, 'Planner is bound to a different grid'
+        return self.search(start, goal, heuristic, diagonals, observer)
+
+    def search(self, start: int, goal: int, heuristic: Optional[Heuristic] = None, \
+               diagonals: Optional[bool] = None, observer: Optional[ISearchObserver] = None) -> SearchResult:
+        if diagonals is None:
+            diagonals = self.grid.diagonals
+
+        if heuristic is None:
+            heuristic = get_heuristic(default_heuristic(diagonals))
+        heuristic = terrain_scaled(heuristic, self.grid.min_cost())
+
+        if diagonals != self._diagonals:
+            self.build(diagonals, observer)
+
+        stats = SearchStats()
+        began = perf_counter()
+
+        hops = self._route(start, goal, heuristic, stats, observer)
+        if hops is None:
+            stats.time = perf_counter() - began
+            return SearchResult(None, 0.0, stats)
+
+        path = [start]
+        for _, _, edge, origin, target in hops:
+            chain = self._chains[edge]
+            for cell in (chain[origin + 1:target + 1] if origin <= target else chain[target:origin][::-1]):
+                # Climbing from a corridor cell can overshoot the meeting point and walk back
+                if len(path) > 1 and path[-2] == cell:
+                    path.pop()
+                else:
+                    path.append(cell)
+
+        stats.time = perf_counter() - began
+        if observer:
+            observer.on_path(path)
+        return SearchResult(path, self._path_cost(path), stats)
+
+    # The graph only counts as built once build returns, so one stopped by the observer starts over
+    def build(self, diagonals: bool, observer: Optional[ISearchObserver] = None) -> None:
+        grid = self.grid
+        self._diagonals = None
+        self._steps = neighbor_steps(grid, diagonals)
+        self._chains = []
+        self._costs = []
+        self._adjacent = {}
+        self._edge_of = array('l', [-1]) * grid.size
+        self._position_of = array('l', [-1]) * grid.size
+
+        passable = grid.passable_mask()
+        masks = np.frombuffer(grid.neighbor_masks(), dtype=np.uint8) & (ALL_BITS if diagonals else ORTHOGONAL_BITS)
+        degree = MASK_DEGREES[masks]
+        nodes = np.flatnonzero(passable & (degree != 2)).tolist()
+
+        for node in nodes:
+            self._adjacent[node] = []
+        for node in nodes:
+            if observer:
+                observer.on_progress()
+            self._walk_from(node)
+
+        # Rings of corridor cells have no junction to start from; any of their cells will do
+        for index in np.flatnonzero(passable & (degree == 2)).tolist():
+            if self._edge_of[index] == -1 and index not in self._adjacent:
+                if observer:
+                    observer.on_progress()
+                self._adjacent[index] = []
+                self._walk_from(index)
+
+        self._strip_dead_ends()
+        self._diagonals = diagonals
+
+    def _passable_neighbors(self, index: int) -> list[int]:
+        mask = self.grid.neighbor_masks()[index]
+        return [index + offset for bit, _, _, offset, _ in self._steps if mask & bit]
+
+    def _walk_from(self, node: int) -> None:
+        for first in self._passable_neighbors(node):
+            # Walked already from the node at its other end
+            if self._edge_of[first] != -1 or (first in self._adjacent and first < node):
+                continue
+
+            chain = [node]
+            previous, current = node, first
+            while current not in self._adjacent:
+                chain.append(current)
+                previous, current = current, next(neighbor for neighbor in self._passable_neighbors(current) \
+                                                  if neighbor != previous)
+            chain.append(current)
+            self._add_edge(chain)
+
+    def _add_edge(self, chain: list[int]) -> None:
+        edge = len(self._chains)
+        costs = array('d', [0.0])
+        for a, b in zip(chain, chain[1:]):
+            costs.append(costs[-1] + self._path_cost([a, b]))
+
+        for position in range(1, len(chain) - 1):
+            self._edge_of[chain[position]] = edge
+            self._position_of[chain[position]] = position
+
+        self._chains.append(chain)
+        self._costs.append(costs)
+        last = len(chain) - 1
+        self._adjacent[chain[0]].append((chain[-1], costs[last], edge, 0, last))
+        self._adjacent[chain[-1]].append((chain[0], costs[last], edge, last, 0))
+
+    def _path_cost(self, path: list[int]) -> float:
+        return self.grid.path_cost(path)
+
+    def _strip_dead_ends(self) -> None:
+        degrees = {node: len(hops) for node, hops in self._adjacent.items()}
+        leaves = [node for node, degree in degrees.items() if degree <= 1]
+        stripped: list[int] = []
+        removed: set[int] = set()
+        self._parent_hops = {}
+
+        while leaves:
+            node = leaves.pop()
+            if node in removed:
+                continue
+
+            removed.add(node)
+            stripped.append(node)
+            for hop in self._adjacent[node]:
+                if hop[0] not in removed:
+                    self._parent_hops[node] = hop
+                    degrees[hop[0]] -= 1
+                    if degrees[hop[0]] <= 1:
+                        leaves.append(hop[0])
+                    break
+
+        self._core = set(self._adjacent) - removed
+        self._depths = dict.fromkeys(self._core, 0)
+        for node in reversed(stripped):
+            hop = self._parent_hops.get(node)
+            self._depths[node] = self._depths[hop[0]] + 1 if hop else 0
+
+    # Where a cell sits in the stripped tree: corridor cells on an edge towards a parent hang off that
+    # parent like a child would; cells on edges between core nodes are left to the core search
+    def _climb_start(self, cell: int) -> tuple[Optional[_Hop], int]:
+        edge = self._edge_of[cell]
+        if edge == -1:
+            return None, self._depths[cell]
+
+        chain = self._chains[edge]
+        for child, end in ((chain[0], len(chain) - 1), (chain[-1], 0)):
+            hop = self._parent_hops.get(child)
+            if hop and hop[2] == edge:
+                position, costs = self._position_of[cell], self._costs[edge]
+                return (chain[end], abs(costs[end] - costs[position]), edge, position, end), self._depths[chain[end]]
+
+        return None, 0
+
+    def _route(self, start: int, goal: int, heuristic: Heuristic, stats: SearchStats, \
+               observer: Optional[ISearchObserver]) -> Optional[list[_Hop]]:
+        if not self.grid.is_passable(start) or not self.grid.is_passable(goal):
+            return None
+
+        # Per side: the hops climbed so far and the nodes (or corridor cell) they started from
+        sides: list[tuple[list[_Hop], list[int]]] = []
+        depths = []
+        for endpoint in (start, goal):
+            hop, depth = self._climb_start(endpoint)
+            sides.append(([hop] if hop else [], [endpoint, hop[0]] if hop else [endpoint]))
+            depths.append(depth)
+
+        # Climb the deeper side until both meet or both reach depth 0
+        (up, up_nodes), (down, down_nodes) = sides
+        depth_a, depth_b = depths
+        while up_nodes[-1] != down_nodes[-1] and (depth_a > 0 or depth_b > 0):
+            stats.expanded += 1
+            if depth_a >= depth_b:
+                hop = self._parent_hops[up_nodes[-1]]
+                up.append(hop)
+                up_nodes.append(hop[0])
+                depth_a -= 1
+            else:
+                hop = self._parent_hops[down_nodes[-1]]
+                down.append(hop)
+                down_nodes.append(hop[0])
+                depth_b -= 1
+
+        a, b = up_nodes[-1], down_nodes[-1]
+        middle: list[_Hop] = []
+        if a != b:
+            if not self._in_core(a) or not self._in_core(b):
+                return None
+            found = self._search_core(a, b, heuristic, stats, observer)
+            if found is None:
+                return None
+            middle = found
+
+        back = [(source, cost, edge, target, origin) for (_, cost, edge, origin, target), source \
+                in zip(reversed(down), reversed(down_nodes[:-1]))]
+        return up + middle + back
+
+    # Core nodes, and corridor cells on edges between two core nodes
+    def _in_core(self, cell: int) -> bool:
+        return cell in self._core or (self._edge_of[cell] != -1 and self._chains[self._edge_of[cell]][0] in self._core \
+                                      and self._chains[self._edge_of[cell]][-1] in self._core)
+
+    # Start and goal cells inside a corridor become temporary nodes splitting their edge
+    def _endpoint_hops(self, start: int, goal: int) -> dict[int, list[_Hop]]:
+        extra: dict[int, list[_Hop]] = {}
+        for endpoint in (start, goal):
+            edge = self._edge_of[endpoint]
+            if edge == -1:
+                continue
+
+            chain, costs = self._chains[edge], self._costs[edge]
+            position, last = self._position_of[endpoint], len(chain) - 1
+            for end, cost in ((0, costs[position]), (last, costs[last] - costs[position])):
+                if endpoint == start:
+                    extra.setdefault(start, []).append((chain[end], cost, edge, position, end))
+                else:
+                    extra.setdefault(chain[end], []).append((goal, cost, edge, end, position))
+
+        if start != goal and self._edge_of[start] != -1 and self._edge_of[start] == self._edge_of[goal]:
+            edge = self._edge_of[start]
+            a, b = self._position_of[start], self._position_of[goal]
+            extra[start].append((goal, abs(self._costs[edge][b] - self._costs[edge][a]), edge, a, b))
+
+        return extra
+
+    def _search_core(self, start: int, goal: int, heuristic: Heuristic, stats: SearchStats, \
+                     observer: Optional[ISearchObserver]) -> Optional[list[_Hop]]:
+        extra = self._endpoint_hops(start, goal)
+        gx, gy = self.grid.coords(goal)
+        best_g = {start: 0.0}
+        parents: dict[int, tuple[int, _Hop]] = {}
+        closed: set[int] = set()
+        counter = 0
+        sx, sy = self.grid.coords(start)
+        h = heuristic(abs(sx - gx), abs(sy - gy))
+        openlist = [(h, h, counter, start)]
+
+        while openlist:
+            stats.peak_open = max(stats.peak_open, len(openlist))
+            current = heappop(openlist)[3]
+            stats.pops += 1
+            if current in closed:
+                stats.stale += 1
+                continue
+
+            closed.add(current)
+            if current == goal:
+                hops = []
+                while current != start:
+                    current, hop = parents[current]
+                    hops.append(hop)
+                hops.reverse()
+                return hops
+
+            stats.expanded += 1
+            if observer:
+                observer.on_expand(current)
+
+            g = best_g[current]
+            for hop in self._adjacent.get(current, []) + extra.get(current, []):
+                neighbor, cost = hop[0], hop[1]
+                ng = g + cost
+                if neighbor in closed or ng >= best_g.get(neighbor, inf) \
+                        or (neighbor not in self._core and neighbor != goal):
+                    continue
+
+                best_g[neighbor] = ng
+                parents[neighbor] = (current, hop)
+                nx, ny = self.grid.coords(neighbor)
+                nh = heuristic(abs(nx - gx), abs(ny - gy))
+                counter += 1
+                heappush(openlist, (ng + nh, nh, counter, neighbor))
+                stats.pushes += 1
+
+        return None
@@ -0,0 +1,215 @@
+from array import array
+from dataclasses import dataclass, field
+from heapq import heappop, heappush
+from math import inf
+from time import perf_counter
+from typing import Callable, Final, Generator, Optional, Protocol
+
+from a_star.heuristics import Heuristic, default_heuristic, euclidean, get_heuristic, terrain_scaled
+from models import TERRAIN_COSTS, Grid
+
+
+class ISearchObserver(Protocol):
+    def on_expand(self, index: int, reverse: bool = False) -> None:
+        pass
+
+    def on_path(self, path: list[int]) -> None:
+        pass
+
+    # Called during work that expands no cells, such as a planner building its graph, so an observer
+    # can stop the search there too
+    def on_progress(self) -> None:
+        pass
+
+
+@dataclass
+class SearchStats:
+    expanded: int = 0
+    pushes: int = 0
+    pops: int = 0
+    stale: int = 0
+    peak_open: int = 0
+    time: float = 0.0
+
+    # Open list entries, stale ones included
+    @property
+    def frontier(self) -> int:
+        return self.pushes - self.pops
+
+
+@dataclass
+class SearchResult:
+    path: Optional[list[int]]
+    cost: float = 0.0
+    stats: SearchStats = field(default_factory=SearchStats)
+
+    @property
+    def found(self) -> bool:
+        return self.path is not None
+
+
+# Searches written as generators yield their running stats after each expansion and return their
+# result, so a caller can run them a slice at a time
+type SearchSteps = Generator[SearchStats, None, SearchResult]
+
+
+def run_steps(steps: SearchSteps) -> SearchResult:
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+
+# Searches that cannot be paused run whole on the first step
+def single_step(search: Callable[..., SearchResult], grid: Grid, start: int, goal: int, \
+                heuristic: Optional[Heuristic] = None, diagonals: Optional[bool] = None, \
+                observer: Optional[ISearchObserver] = None) -> SearchSteps:
+    result = search(grid, start, goal, heuristic, diagonals, observer)
+    yield from ()
+    return result
+
+
+class SteppedSearch:
+    # Expansions between two looks at the clock
+    CHECK_INTERVAL: Final[int] = 64
+
+    def __init__(self, steps: SearchSteps) -> None:
+        self._steps = steps
+        self.result: Optional[SearchResult] = None
+        # Stats as of the last step; searches that cannot be paused have none until they finish
+        self.stats: Optional[SearchStats] = None
+        # Time spent stepping, which leaves out whatever the caller does between steps
+        self.elapsed: float = 0.0
+
+    # Runs the search for about budget seconds; returns whether it has finished
+    def step(self, budget: float) -> bool:
+        if self.result is not None:
+            return True
+
+        steps = self._steps
+        began = perf_counter()
+        deadline = began + budget
+        try:
+            while perf_counter() < deadline:
+                for _ in range(self.CHECK_INTERVAL):
+                    self.stats = next(steps)
+        except StopIteration as stop:
+            self.result = stop.value
+            self.result.stats.time = self.elapsed + perf_counter() - began
+            self.stats = self.result.stats
+
+        self.elapsed += perf_counter() - began
+        return self.result is not None
+
+
+# Mask bit, dx, dy, index offset and length of every step, in the bit order of Grid.neighbor_masks.
+# A step is allowed from a cell when its bit is set in the cell's mask, which also rules out steps
+# leaving the grid, so searches need no bounds or passability checks of their own.
+type Step = tuple[int, int, int, int, float]
+
+_STEP_LENGTHS: Final[tuple[float, ...]] = tuple(euclidean(abs(dx), abs(dy)) for dx, dy in Grid.DIRECTIONS)
+
+
+def neighbor_steps(grid: Grid, diagonals: bool) -> list[Step]:
+    count = len(Grid.DIRECTIONS) if diagonals else len(Grid.ORTHOGONAL_OFFSETS)
+    return [(1 << direction, dx, dy, dy * grid.width + dx, _STEP_LENGTHS[direction]) \
+            for direction, (dx, dy) in enumerate(Grid.DIRECTIONS[:count])]
+
+
+def trace_path(parents: array, start: int, end: int) -> list[int]:
+    path = [end]
+    while end != start:
+        end = parents[end]
+        path.append(end)
+    path.reverse()
+
+    return path
+
+
+def search(grid: Grid, start: int, goal: int, heuristic: Optional[Heuristic] = None, \
+           diagonals: Optional[bool] = None, observer: Optional[ISearchObserver] = None) -> SearchResult:
+    return run_steps(search_steps(grid, start, goal, heuristic, diagonals, observer))
+
+
+def search_steps(grid: Grid, start: int, goal: int, heuristic: Optional[Heuristic] = None, \
+                 diagonals: Optional[bool] = None, observer: Optional[ISearchObserver] = None) -> SearchSteps:
+    if diagonals is None:
+        diagonals = grid.diagonals
+
+    if heuristic is None:
+        heuristic = get_heuristic(default_heuristic(diagonals))
+    heuristic = terrain_scaled(heuristic, grid.min_cost())
+
+    width = grid.width
+    steps = neighbor_steps(grid, diagonals)
+    masks = grid.neighbor_masks()
+    # Terrain lookups are skipped entirely on all-plain grids
+    weighted = grid.has_terrain()
+    terrain = grid.terrain
+    gx, gy = grid.coords(goal)
+    stats = SearchStats()
+    began = perf_counter()
+
+    best_g = array('d', [inf]) * grid.size
+    parents = array('l', [-1]) * grid.size
+    closed = bytearray(grid.size)
+    # Ties on f are broken towards lower h (i.e. higher g), then by insertion order
+    counter = 0
+
+    sx, sy = grid.coords(start)
+    h = heuristic(abs(sx - gx), abs(sy - gy))
+    best_g[start] = 0.0
+    openlist: list[tuple[float, float, int, int]] = [(h, h, counter, start)]
+    stats.pushes += 1
+
+    while openlist:
+        if len(openlist) > stats.peak_open:
+            stats.peak_open = len(openlist)
+        current = heappop(openlist)[3]
+        stats.pops += 1
+
+        if closed[current]:
+            stats.stale += 1
+            continue
+
+        closed[current] = 1
+
+        if current == goal:
+            path = trace_path(parents, start, goal)
+
+            stats.time = perf_counter() - began
+            if observer:
+                observer.on_path(path)
+            return SearchResult(path, best_g[goal], stats)
+
+        stats.expanded += 1
+        if observer:
+            observer.on_expand(current)
+        yield stats
+
+        y, x = divmod(current, width)
+        g = best_g[current]
+        weight = TERRAIN_COSTS[terrain[current]] if weighted else 1.0
+        mask = masks[current]
+        for bit, dx, dy, offset, cost in steps:
+            if not mask & bit:
+                continue
+
+            neighbor = current + offset
+            if closed[neighbor]:
+                continue
+
+            ng = g + (cost * (weight + TERRAIN_COSTS[terrain[neighbor]]) / 2 if weighted else cost)
+            if ng >= best_g[neighbor]:
+                continue
+
+            best_g[neighbor] = ng
+            parents[neighbor] = current
+            nh = heuristic(abs(x + dx - gx), abs(y + dy - gy))
+            counter += 1
+            heappush(openlist, (ng + nh, nh, counter, neighbor))
+            stats.pushes += 1
+
+    stats.time = perf_counter() - began
+    return SearchResult(None, 0.0, stats)
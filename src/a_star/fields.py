@@ -0,0 +1,159 @@
+from array import array
+from heapq import heappop, heappush
+from math import inf
+from time import perf_counter
+from typing import Final, Iterable, Optional
+
+import numpy as np
+
+from a_star.engine import ISearchObserver, SearchResult, SearchStats, neighbor_steps
+from models import TERRAIN_COSTS, Grid
+
+# Step code of cells with no next step: the source itself and cells it cannot reach
+NO_STEP: Final[int] = 255
+
+
+# Dijkstra from source over the whole grid, or until every target is settled. Instead of parents it
+# records, per cell, which neighbour step reached it (one byte); the parent is the cell one step back.
+def _dijkstra(grid: Grid, source: int, diagonals: bool, observer: Optional[ISearchObserver], \
+              targets: Optional[set[int]], stats: SearchStats) -> tuple[array, bytearray]:
+    steps = list(enumerate(neighbor_steps(grid, diagonals)))
+    masks = grid.neighbor_masks()
+    weighted = grid.has_terrain()
+    terrain = grid.terrain
+    remaining = set(targets) if targets is not None else None
+
+    best_g = array('d', [inf]) * grid.size
+    directions = bytearray([NO_STEP]) * grid.size
+    closed = bytearray(grid.size)
+
+    best_g[source] = 0.0
+    openlist: list[tuple[float, int]] = [(0.0, source)]
+    stats.pushes += 1
+
+    while openlist:
+        if len(openlist) > stats.peak_open:
+            stats.peak_open = len(openlist)
+        g, current = heappop(openlist)
+        stats.pops += 1
+
+        if closed[current]:
+            stats.stale += 1
+            continue
+
+        closed[current] = 1
+        if remaining is not None:
+            remaining.discard(current)
+            if not remaining:
+                break
+
+        stats.expanded += 1
+        if observer:
+            observer.on_expand(current)
+
+        weight = TERRAIN_COSTS[terrain[current]] if weighted else 1.0
+        mask = masks[current]
+        for direction, (bit, _, _, offset, cost) in steps:
+            if not mask & bit:
+                continue
+
+            neighbor = current + offset
+            if closed[neighbor]:
+                continue
+
+            ng = g + (cost * (weight + TERRAIN_COSTS[terrain[neighbor]]) / 2 if weighted else cost)
+            if ng >= best_g[neighbor]:
+                continue
+
+            best_g[neighbor] = ng
+            directions[neighbor] = direction
+            heappush(openlist, (ng, neighbor))
+            stats.pushes += 1
+
+    return best_g, directions
+
+
+def _trace_back(offsets: list[int], directions: bytearray, source: int, cell: int) -> list[int]:
+    path = [cell]
+    while cell != source:
+        cell -= offsets[directions[cell]]
+        path.append(cell)
+
+    return path
+
+
+# One search from start settles every goal, instead of one search per goal. Goals that cannot be
+# reached get a result without a path; all results share the stats of the one search.
+def one_to_many_search(grid: Grid, start: int, goals: Iterable[int], diagonals: Optional[bool] = None, \
+                       observer: Optional[ISearchObserver] = None) -> dict[int, SearchResult]:
+    if diagonals is None:
+        diagonals = grid.diagonals
+
+    targets = set(goals)
+    stats = SearchStats()
+    began = perf_counter()
+    best_g, directions = _dijkstra(grid, start, diagonals, observer, targets, stats)
+    offsets = [offset for _, _, _, offset, _ in neighbor_steps(grid, diagonals)]
+
+    results: dict[int, SearchResult] = {}
+    for goal in targets:
+        if best_g[goal] == inf:
+            results[goal] = SearchResult(None, 0.0, stats)
+            continue
+
+        path = _trace_back(offsets, directions, start, goal)
+        path.reverse()
+        results[goal] = SearchResult(path, best_g[goal], stats)
+        if observer:
+            observer.on_path(path)
+
+    stats.time = perf_counter() - began
+    return results
+
+
+# Distance from every cell to one goal, and the step each cell takes towards it, so any number of
+# agents can follow the field to the goal at O(1) per step. Distances are float32 and steps one byte
+# per cell. The field is a snapshot: it does not follow later changes to the grid.
+class DistanceField:
+    def __init__(self, grid: Grid, goal: int, diagonals: Optional[bool] = None, \
+                 observer: Optional[ISearchObserver] = None) -> None:
+        if diagonals is None:
+            diagonals = grid.diagonals
+
+        self.grid = grid
+        self.goal = goal
+        self.diagonals = diagonals
+        self.stats = SearchStats()
+        began = perf_counter()
+        best_g, self._directions = _dijkstra(grid, goal, diagonals, observer, None, self.stats)
+        self._offsets = [offset for _, _, _, offset, _ in neighbor_steps(grid, diagonals)]
+        self.distances: np.ndarray = np.frombuffer(best_g, dtype=np.float64).astype(np.float32)
+        self.stats.time = perf_counter() - began
+
+    @property
+    def directions(self) -> np.ndarray:
+        return np.frombuffer(self._directions, dtype=np.uint8)
+
+    @property
+    def nbytes(self) -> int:
+        return self.distances.nbytes + len(self._directions)
+
+    def distance(self, index: int) -> float:
+        return float(self.distances[index])
+
+    def reachable(self, index: int) -> bool:
+        return index == self.goal or self._directions[index] != NO_STEP
+
+    def next_step(self, index: int) -> Optional[int]:
+        direction = self._directions[index]
+        if direction == NO_STEP:
+            return None
+
+        return index - self._offsets[direction]
+
+    # From index to the goal, both included
+    def path_from(self, index: int) -> Optional[list[int]]:
+        if not self.reachable(index):
+            return None
+
+        return _trace_back(self._offsets, self._directions, self.goal, index)
@@ -0,0 +1,72 @@
+from math import sqrt
+from typing import Callable, Final
+
+from errors import InvalidArgValueError
+
+type Heuristic = Callable[[int, int], float]
+
+_DIAGONAL_PREMIUM: Final[float] = sqrt(2) - 1
+
+
+def manhattan(dx: int, dy: int) -> float:
+    return dx + dy
+
+
+def octile(dx: int, dy: int) -> float:
+    return max(dx, dy) + _DIAGONAL_PREMIUM * min(dx, dy)
+
+
+def chebyshev(dx: int, dy: int) -> float:
+    return max(dx, dy)
+
+
+def euclidean(dx: int, dy: int) -> float:
+    return sqrt(dx * dx + dy * dy)
+
+
+def zero(dx: int, dy: int) -> float:
+    return 0
+
+
+def weighted(heuristic: Heuristic, epsilon: float) -> Heuristic:
+    def inner(dx: int, dy: int) -> float:
+        return epsilon * heuristic(dx, dy)
+
+    return inner
+
+
+# Terrain cheaper than plain ground makes steps cost less than their length; scaling by the cheapest
+# multiplier on the grid keeps the heuristic admissible (and makes it tighter on costlier grids)
+def terrain_scaled(heuristic: Heuristic, min_cost: float) -> Heuristic:
+    return heuristic if min_cost == 1.0 else weighted(heuristic, min_cost)
+
+
+HEURISTICS: Final[dict[str, Heuristic]] = {
+    'manhattan': manhattan,
+    'octile': octile,
+    'chebyshev': chebyshev,
+    'euclidean': euclidean,
+    'zero': zero,
+}
+
+
+def default_heuristic(diagonals: bool) -> str:
+    return 'octile' if diagonals else 'manhattan'
+
+
+# Weighted heuristics handed out so far; the same name and weight always give the same callable, so
+# planners that compare queries (LPA*) recognise a repeated query
+_WEIGHTED: dict[tuple[str, float], Heuristic] = {}
+
+
+def get_heuristic(name: str, epsilon: float = 1.0) -> Heuristic:
+    if name not in HEURISTICS:
+        raise InvalidArgValueError(list(HEURISTICS), name)
+
+    heuristic = HEURISTICS[name]
+    if epsilon == 1.0:
+        return heuristic
+
+    if (name, epsilon) not in _WEIGHTED:
+        _WEIGHTED[name, epsilon] = weighted(heuristic, epsilon)
+    return _WEIGHTED[name, epsilon]
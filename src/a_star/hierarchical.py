@@ -0,0 +1,304 @@
+from heapq import heappop, heappush
+from math import inf
+from time import perf_counter
+from typing import Final, Optional
+
+from a_star.engine import ISearchObserver, SearchResult, SearchStats, Step, neighbor_steps, search
+from a_star.heuristics import Heuristic, default_heuristic, get_heuristic
+from models import Grid, IPassabilityListener
+
+type _Edges = list[tuple[int, float]]
+type _Transition = tuple[int, int]
+
+
+# HPA*: the grid is cut into square clusters, every passable stretch of a cluster border gets one or
+# two transitions, and the distances between the transitions inside each cluster are precomputed.
+# Queries search that abstract graph and only run cell-level searches inside the clusters the route
+# crosses. Edits mark their clusters dirty and only those (and their neighbours' shared borders) are
+# rebuilt before the next query.
+class HierarchicalPlanner(IPassabilityListener):
+    CLUSTER_SIZE: Final[int] = 16
+    # Border stretches at least this long get a transition at both ends instead of one in the middle
+    LONG_ENTRANCE: Final[int] = 6
+
+    def __init__(self, grid: Grid, cluster_size: int = CLUSTER_SIZE) -> None:
+        self.grid = grid
+        self.cluster_size = cluster_size
+        self.columns = -(-grid.width // cluster_size)
+        self.rows = -(-grid.height // cluster_size)
+        self._diagonals: Optional[bool] = None
+        self._steps: list[Step] = []
+        self._borders: dict[tuple[int, int], list[_Transition]] = {}
+        self._partners: dict[int, list[int]] = {}
+        self._intra: dict[int, dict[int, _Edges]] = {}
+        self._dirty: set[int] = set()
+        grid.add_passability_listener(self)
+
+    def close(self) -> None:
+        self.grid.remove_passability_listener(self)
+
+    def on_passability_change(self, index: int) -> None:
+        if self._diagonals is None:
+            return
+
+        self._dirty.add(self.cluster(index))
+        for neighbor in self.grid.neighbors(index):
+            self._dirty.add(self.cluster(neighbor))
+
+    def on_passability_reset(self) -> None:
+        self._diagonals = None
+        self._dirty.clear()
+
+    # The abstract graph only follows passability; queries on grids with terrain skip it altogether
+    def on_cost_change(self, index: int) -> None:
+        pass
+
+    def on_cost_reset(self) -> None:
+        pass
+
+    def cluster(self, index: int) -> int:
+        y, x = divmod(index, self.grid.width)
+        return (y // self.cluster_size) * self.columns + x // self.cluster_size
+
+    @property
+    def node_count(self) -> int:
+        return sum(len(nodes) for nodes in self._intra.values())
+
+    def __call__(self, grid: Grid, start: int, goal: int, heuristic: Optional[Heuristic] = None, \
+                 diagonals: Optional[bool] = None, observer: Optional[ISearchObserver] = None) -> SearchResult:
+        assert grid is self.grid, 'Planner is bound to a different grid'
+        return self.search(start, goal, heuristic, diagonals, observer)
+
+    def search(self, start: int, goal: int, heuristic: Optional[Heuristic] = None, \
+               diagonals: Optional[bool] = None, observer: Optional[ISearchObserver] = None) -> SearchResult:
+        if diagonals is None:
+            diagonals = self.grid.diagonals
+
+        if heuristic is None:
+            heuristic = get_heuristic(default_heuristic(diagonals))
+
+        # Cluster paths are planned, and their costs cached, with plain step costs
+        if self.grid.has_terrain():
+            return search(self.grid, start, goal, heuristic, diagonals, observer)
+
+        self.update(diagonals, observer)
+        stats = SearchStats()
+        began = perf_counter()
+
+        abstract = self._search_abstract(start, goal, heuristic, stats, observer)
+        if abstract is None:
+            stats.time = perf_counter() - began
+            # Transitions only cross borders orthogonally, so with diagonals a route that only
+            # squeezes through corners can be missed
+            if diagonals:
+                return search(self.grid, start, goal, heuristic, diagonals, observer)
+            return SearchResult(None, 0.0, stats)
+
+        nodes, cost = abstract
+        path = [start]
+        for a, b in zip(nodes, nodes[1:]):
+            if b in self._partners.get(a, ()):
+                path.append(b)
+            else:
+                _, parents = self._search_cluster(a, {b}, self.cluster(a), stats)
+                path.extend(self._trace(parents, a, b)[1:])
+
+        stats.time = perf_counter() - began
+        if observer:
+            observer.on_path(path)
+        return SearchResult(path, cost, stats)
+
+    # Builds the abstract graph on first use and afterwards rebuilds only what edits touched. The
+    # clusters stay dirty until the rebuild is done, so one stopped by the observer resumes next time.
+    def update(self, diagonals: bool, observer: Optional[ISearchObserver] = None) -> None:
+        if diagonals != self._diagonals:
+            self._diagonals = diagonals
+            self._steps = neighbor_steps(self.grid, diagonals)
+            self._borders.clear()
+            self._partners.clear()
+            self._intra.clear()
+            self._dirty = set(range(self.columns * self.rows))
+
+        if not self._dirty:
+            return
+
+        affected = set(self._dirty)
+        for pair in {pair for cluster in self._dirty for pair in self._adjacent_pairs(cluster)}:
+            if observer:
+                observer.on_progress()
+            self._build_border(pair)
+            affected.update(pair)
+
+        for cluster in affected:
+            if observer:
+                observer.on_progress()
+            self._build_intra(cluster)
+        self._dirty.clear()
+
+    def _bounds(self, cluster: int) -> tuple[int, int, int, int]:
+        row, column = divmod(cluster, self.columns)
+        x0, y0 = column * self.cluster_size, row * self.cluster_size
+        return x0, y0, min(x0 + self.cluster_size, self.grid.width), min(y0 + self.cluster_size, self.grid.height)
+
+    def _adjacent_pairs(self, cluster: int) -> list[tuple[int, int]]:
+        row, column = divmod(cluster, self.columns)
+        pairs = []
+        if column > 0:
+            pairs.append((cluster - 1, cluster))
+        if column < self.columns - 1:
+            pairs.append((cluster, cluster + 1))
+        if row > 0:
+            pairs.append((cluster - self.columns, cluster))
+        if row < self.rows - 1:
+            pairs.append((cluster, cluster + self.columns))
+        return pairs
+
+    def _build_border(self, pair: tuple[int, int]) -> None:
+        for a, b in self._borders.pop(pair, []):
+            self._partners[a].remove(b)
+            self._partners[b].remove(a)
+
+        first, second = pair
+        x0, y0, x1, y1 = self._bounds(first)
+        width = self.grid.width
+        # Side by side when both sit in the same row of clusters; with one column, c and c + 1 are stacked
+        if first // self.columns == second // self.columns:
+            crossings = [(y * width + x1 - 1, y * width + x1) for y in range(y0, y1)]
+        else:
+            crossings = [((y1 - 1) * width + x, y1 * width + x) for x in range(x0, x1)]
+
+        transitions: list[_Transition] = []
+        run: list[_Transition] = []
+        for crossing in crossings + [(-1, -1)]:
+            if crossing[0] >= 0 and self.grid.is_passable(crossing[0]) and self.grid.is_passable(crossing[1]):
+                run.append(crossing)
+                continue
+
+            if len(run) >= self.LONG_ENTRANCE:
+                transitions += [run[0], run[-1]]
+            elif run:
+                transitions.append(run[len(run) // 2])
+            run = []
+
+        self._borders[pair] = transitions
+        for a, b in transitions:
+            self._partners.setdefault(a, []).append(b)
+            self._partners.setdefault(b, []).append(a)
+
+    def _build_intra(self, cluster: int) -> None:
+        nodes = sorted({node for pair in self._adjacent_pairs(cluster) for transition in self._borders.get(pair, []) \
+                        for node in transition if self.cluster(node) == cluster})
+        edges: dict[int, _Edges] = {node: [] for node in nodes}
+        for i, node in enumerate(nodes):
+            costs, _ = self._search_cluster(node, set(nodes[i + 1:]), cluster)
+            for other, cost in costs.items():
+                edges[node].append((other, cost))
+                edges[other].append((node, cost))
+        self._intra[cluster] = edges
+
+    # Dijkstra confined to one cluster, stopping once every target is settled
+    def _search_cluster(self, source: int, targets: set[int], cluster: int, \
+                        stats: Optional[SearchStats] = None) -> tuple[dict[int, float], dict[int, int]]:
+        x0, y0, x1, y1 = self._bounds(cluster)
+        width = self.grid.width
+        masks = self.grid.neighbor_masks()
+        best_g = {source: 0.0}
+        parents = {source: source}
+        closed: set[int] = set()
+        found: dict[int, float] = {}
+        openlist = [(0.0, source)]
+
+        while openlist and len(found) < len(targets):
+            g, current = heappop(openlist)
+            if current in closed:
+                continue
+
+            closed.add(current)
+            if stats:
+                stats.expanded += 1
+            if current in targets:
+                found[current] = g
+
+            y, x = divmod(current, width)
+            mask = masks[current]
+            for bit, dx, dy, offset, cost in self._steps:
+                nx = x + dx
+                ny = y + dy
+                if not mask & bit or nx < x0 or nx >= x1 or ny < y0 or ny >= y1:
+                    continue
+
+                neighbor = current + offset
+                if neighbor in closed:
+                    continue
+
+                ng = g + cost
+                if ng < best_g.get(neighbor, inf):
+                    best_g[neighbor] = ng
+                    parents[neighbor] = current
+                    heappush(openlist, (ng, neighbor))
+
+        return found, parents
+
+    @staticmethod
+    def _trace(parents: dict[int, int], start: int, end: int) -> list[int]:
+        path = [end]
+        while end != start:
+            end = parents[end]
+            path.append(end)
+        path.reverse()
+        return path
+
+    # A* over the transitions, with the start and goal joined to the transitions of their clusters
+    def _search_abstract(self, start: int, goal: int, heuristic: Heuristic, stats: SearchStats, \
+                         observer: Optional[ISearchObserver]) -> Optional[tuple[list[int], float]]:
+        extra: dict[int, _Edges] = {}
+        for endpoint in (start, goal):
+            cluster = self.cluster(endpoint)
+            targets = set(self._intra[cluster]) | ({start, goal} if self.cluster(start) == self.cluster(goal) else set())
+            costs, _ = self._search_cluster(endpoint, targets - {endpoint}, cluster, stats)
+            for node, cost in costs.items():
+                extra.setdefault(endpoint, []).append((node, cost))
+                extra.setdefault(node, []).append((endpoint, cost))
+
+        gx, gy = self.grid.coords(goal)
+        best_g = {start: 0.0}
+        parents = {start: start}
+        closed: set[int] = set()
+        counter = 0
+        sx, sy = self.grid.coords(start)
+        h = heuristic(abs(sx - gx), abs(sy - gy))
+        openlist = [(h, h, counter, start)]
+
+        while openlist:
+            stats.peak_open = max(stats.peak_open, len(openlist))
+            current = heappop(openlist)[3]
+            stats.pops += 1
+            if current in closed:
+                stats.stale += 1
+                continue
+
+            closed.add(current)
+            if current == goal:
+                return self._trace(parents, start, goal), best_g[goal]
+
+            stats.expanded += 1
+            if observer:
+                observer.on_expand(current)
+
+            g = best_g[current]
+            edges = self._intra[self.cluster(current)].get(current, []) \
+                + [(partner, 1.0) for partner in self._partners.get(current, ())] + extra.get(current, [])
+            for neighbor, cost in edges:
+                ng = g + cost
+                if neighbor in closed or ng >= best_g.get(neighbor, inf):
+                    continue
+
+                best_g[neighbor] = ng
+                parents[neighbor] = current
+                nx, ny = self.grid.coords(neighbor)
+                nh = heuristic(abs(nx - gx), abs(ny - gy))
+                counter += 1
+                heappush(openlist, (ng + nh, nh, counter, neighbor))
+                stats.pushes += 1
+
+        return None
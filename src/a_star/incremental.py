@@ -0,0 +1,213 @@
+from array import array
+from heapq import heappop, heappush
+from math import inf
+from time import perf_counter
+from typing import Final, Optional
+
+from a_star.engine import ISearchObserver, SearchResult, SearchStats, Step, neighbor_steps
+from a_star.heuristics import Heuristic, default_heuristic, get_heuristic
+from models import TERRAIN_COSTS, Grid, IPassabilityListener
+
+type _Key = tuple[float, float]
+
+
+class IncrementalPlanner(IPassabilityListener):
+    # Past this share of changed cells a fresh search is cheaper than repairing
+    REPLAN_THRESHOLD: Final[float] = 0.1
+    # Keys closer than this count as tied: costs summed along different routes differ in the last bits
+    KEY_TOLERANCE: Final[float] = 1e-9
+
+    def __init__(self, grid: Grid) -> None:
+        self.grid = grid
+        self._query: Optional[tuple[int, int, Heuristic, bool]] = None
+        self._changed: set[int] = set()
+        self._g = array('d')
+        self._rhs = array('d')
+        self._queue: list[tuple[float, float, int, int]] = []
+        self._queued: dict[int, _Key] = {}
+        self._counter = 0
+        self._steps: list[Step] = []
+        # Heuristic scale for the grid's cheapest terrain; a change of it invalidates every key
+        self._heuristic_scale: float = 1.0
+        self._weighted: bool = False
+        grid.add_passability_listener(self)
+
+    def close(self) -> None:
+        self.grid.remove_passability_listener(self)
+
+    def on_passability_change(self, index: int) -> None:
+        if self._query is not None:
+            self._changed.add(index)
+
+    def on_passability_reset(self) -> None:
+        self._query = None
+        self._changed.clear()
+
+    # Costs of the steps into and out of the cell change, which repairs just like a passability change
+    def on_cost_change(self, index: int) -> None:
+        self.on_passability_change(index)
+
+    def on_cost_reset(self) -> None:
+        self.on_passability_reset()
+
+    def __call__(self, grid: Grid, start: int, goal: int, heuristic: Optional[Heuristic] = None, \
+                 diagonals: Optional[bool] = None, observer: Optional[ISearchObserver] = None) -> SearchResult:
+        assert grid is self.grid, 'Planner is bound to a different grid'
+        return self.search(start, goal, heuristic, diagonals, observer)
+
+    def search(self, start: int, goal: int, heuristic: Optional[Heuristic] = None, \
+               diagonals: Optional[bool] = None, observer: Optional[ISearchObserver] = None) -> SearchResult:
+        if diagonals is None:
+            diagonals = self.grid.diagonals
+
+        if heuristic is None:
+            heuristic = get_heuristic(default_heuristic(diagonals))
+
+        stats = SearchStats()
+        began = perf_counter()
+
+        query = (start, goal, heuristic, diagonals)
+        scale = self.grid.min_cost()
+        self._weighted = self.grid.has_terrain()
+        if query != self._query or scale != self._heuristic_scale \
+                or len(self._changed) > self.grid.size * self.REPLAN_THRESHOLD:
+            self._heuristic_scale = scale
+            self._reset(query)
+        else:
+            # A changed cell can also open or close the diagonal steps between the cells around it
+            for index in self._changed:
+                self._update_vertex(index)
+                for neighbor in self._around(index):
+                    self._update_vertex(neighbor)
+        self._changed.clear()
+
+        self._compute_shortest_path(stats, observer)
+        path = self._extract_path() if self._g[goal] != inf else None
+        if path is None and self._g[goal] != inf:
+            # The repair left cells on the way back inconsistent; plan again from scratch
+            self._reset(query)
+            self._compute_shortest_path(stats, observer)
+            path = self._extract_path() if self._g[goal] != inf else None
+        stats.time = perf_counter() - began
+
+        if path is None:
+            return SearchResult(None, 0.0, stats)
+
+        if observer:
+            observer.on_path(path)
+        return SearchResult(path, self._g[goal], stats)
+
+    def _reset(self, query: tuple[int, int, Heuristic, bool]) -> None:
+        start, _, _, diagonals = query
+        self._query = query
+        self._steps = neighbor_steps(self.grid, diagonals)
+        self._g = array('d', [inf]) * self.grid.size
+        self._rhs = array('d', [inf]) * self.grid.size
+        self._queue.clear()
+        self._queued.clear()
+
+        self._rhs[start] = 0.0
+        self._enqueue(start)
+
+    def _key(self, index: int) -> _Key:
+        assert self._query is not None
+        _, goal, heuristic, _ = self._query
+        (x, y), (gx, gy) = self.grid.coords(index), self.grid.coords(goal)
+        best = min(self._g[index], self._rhs[index])
+        return best + heuristic(abs(x - gx), abs(y - gy)) * self._heuristic_scale, best
+
+    def _enqueue(self, index: int) -> None:
+        key = self._key(index)
+        self._queued[index] = key
+        self._counter += 1
+        heappush(self._queue, (key[0], key[1], self._counter, index))
+
+    def _top_key(self) -> _Key:
+        while self._queue:
+            k1, k2, _, index = self._queue[0]
+            if self._queued.get(index) == (k1, k2):
+                return k1, k2
+            heappop(self._queue)
+        return inf, inf
+
+    # Cells one allowed step away, which are all passable
+    def _neighbors(self, index: int) -> list[tuple[int, float]]:
+        mask = self.grid.neighbor_masks()[index]
+        neighbors = [(index + offset, cost) for bit, _, _, offset, cost in self._steps if mask & bit]
+        if not self._weighted:
+            return neighbors
+
+        terrain = self.grid.terrain
+        weight = TERRAIN_COSTS[terrain[index]]
+        return [(neighbor, cost * (weight + TERRAIN_COSTS[terrain[neighbor]]) / 2) for neighbor, cost in neighbors]
+
+    def _around(self, index: int) -> list[int]:
+        width, height = self.grid.width, self.grid.height
+        y, x = divmod(index, width)
+        return [index + offset for _, dx, dy, offset, _ in self._steps \
+                if 0 <= x + dx < width and 0 <= y + dy < height]
+
+    def _update_vertex(self, index: int) -> None:
+        assert self._query is not None
+        start = self._query[0]
+        if index != start:
+            best = inf
+            if self.grid.is_passable(index):
+                for neighbor, cost in self._neighbors(index):
+                    if self._g[neighbor] + cost < best:
+                        best = self._g[neighbor] + cost
+            self._rhs[index] = best
+
+        self._queued.pop(index, None)
+        if self._g[index] != self._rhs[index]:
+            self._enqueue(index)
+
+    # Whether a comes before b, with ties on the first key decided by the second
+    def _before(self, a: _Key, b: _Key) -> bool:
+        if a[0] < b[0] - self.KEY_TOLERANCE:
+            return True
+        return a[0] <= b[0] + self.KEY_TOLERANCE and a[1] < b[1] - self.KEY_TOLERANCE
+
+    def _compute_shortest_path(self, stats: SearchStats, observer: Optional[ISearchObserver]) -> None:
+        assert self._query is not None
+        goal = self._query[1]
+        while self._before(self._top_key(), self._key(goal)) or self._rhs[goal] != self._g[goal]:
+            stats.peak_open = max(stats.peak_open, len(self._queued))
+            index = heappop(self._queue)[3]
+            del self._queued[index]
+            stats.pops += 1
+            stats.expanded += 1
+            if observer:
+                observer.on_expand(index)
+
+            if self._g[index] > self._rhs[index]:
+                # Only this cell's g dropped, so a neighbour's rhs can only fall to the new value through it
+                g = self._g[index] = self._rhs[index]
+                for neighbor, cost in self._neighbors(index):
+                    if g + cost < self._rhs[neighbor]:
+                        self._rhs[neighbor] = g + cost
+                        self._enqueue(neighbor)
+            else:
+                self._g[index] = inf
+                self._update_vertex(index)
+                for neighbor, _ in self._neighbors(index):
+                    self._update_vertex(neighbor)
+
+    # Walks back from the goal through consistent cells only; None if the walk gets stuck or comes
+    # back to a cell it has already passed
+    def _extract_path(self) -> Optional[list[int]]:
+        assert self._query is not None
+        start, goal, _, _ = self._query
+        path = [goal]
+        visited = {goal}
+        current = goal
+        while current != start:
+            best, current = min(((self._g[neighbor] + cost, neighbor) for neighbor, cost in self._neighbors(current) \
+                                 if self._g[neighbor] == self._rhs[neighbor]), default=(inf, -1))
+            if best == inf or current in visited:
+                return None
+            visited.add(current)
+            path.append(current)
+        path.reverse()
+
+        return path
@@ -0,0 +1,233 @@
+from array import array
+from heapq import heappop, heappush
+from math import inf, sqrt
+from time import perf_counter
+from typing import Callable, Final, Optional
+
+from a_star.engine import ISearchObserver, SearchResult, SearchStats, SearchSteps, run_steps, search_steps, trace_path
+from a_star.heuristics import Heuristic, default_heuristic, get_heuristic
+from enums import DiagonalRule
+from models import Grid
+
+type _Walkable = Callable[[int, int], bool]
+type _Direction = tuple[int, int]
+
+_SQRT2: Final[float] = sqrt(2)
+_ORTHOGONAL: Final[tuple[_Direction, ...]] = ((0, -1), (0, 1), (-1, 0), (1, 0))
+_ALL: Final[tuple[_Direction, ...]] = _ORTHOGONAL + ((1, -1), (1, 1), (-1, -1), (-1, 1))
+
+
+def _sign(value: int) -> int:
+    return (value > 0) - (value < 0)
+
+
+# With 4-connectivity vertical moves play the role diagonals have with 8-connectivity: a vertical
+# scan stops wherever a horizontal scan from it finds a jump point, and a horizontal scan stops
+# where a vertical branch becomes forced
+class _Jumper:
+    def __init__(self, walkable: _Walkable, goal: tuple[int, int], diagonals: bool) -> None:
+        self._walkable = walkable
+        self._goal = goal
+        self._diagonals = diagonals
+
+    def successors(self, x: int, y: int, dx: int, dy: int) -> list[_Direction]:
+        if dx == 0 and dy == 0:
+            return list(_ALL if self._diagonals else _ORTHOGONAL)
+
+        if self._diagonals:
+            return self._successors_8(x, y, dx, dy)
+
+        return self._successors_4(x, y, dx, dy)
+
+    def jump(self, x: int, y: int, dx: int, dy: int) -> Optional[tuple[int, int]]:
+        if self._diagonals:
+            return self._jump_8(x, y, dx, dy)
+
+        if dy == 0:
+            return self._jump_horizontal_4(x, y, dx)
+
+        return self._jump_vertical_4(x, y, dy)
+
+    def _successors_4(self, x: int, y: int, dx: int, dy: int) -> list[_Direction]:
+        walkable = self._walkable
+        if dy != 0:
+            return [(0, dy), (1, 0), (-1, 0)]
+
+        directions = [(dx, 0)]
+        for side in (-1, 1):
+            if walkable(x, y + side) and not walkable(x - dx, y + side):
+                directions.append((0, side))
+        return directions
+
+    def _successors_8(self, x: int, y: int, dx: int, dy: int) -> list[_Direction]:
+        walkable = self._walkable
+        if dx != 0 and dy != 0:
+            directions = [(dx, 0), (0, dy), (dx, dy)]
+            if not walkable(x - dx, y) and walkable(x - dx, y + dy):
+                directions.append((-dx, dy))
+            if not walkable(x, y - dy) and walkable(x + dx, y - dy):
+                directions.append((dx, -dy))
+            return directions
+
+        directions = [(dx, dy)]
+        for side in (-1, 1):
+            if dx != 0 and not walkable(x, y + side) and walkable(x + dx, y + side):
+                directions.append((dx, side))
+            elif dy != 0 and not walkable(x + side, y) and walkable(x + side, y + dy):
+                directions.append((side, dy))
+        return directions
+
+    def _jump_horizontal_4(self, x: int, y: int, dx: int) -> Optional[tuple[int, int]]:
+        walkable = self._walkable
+        while True:
+            x += dx
+            if not walkable(x, y):
+                return None
+            if (x, y) == self._goal:
+                return x, y
+            for side in (-1, 1):
+                if walkable(x, y + side) and not walkable(x - dx, y + side):
+                    return x, y
+
+    def _jump_vertical_4(self, x: int, y: int, dy: int) -> Optional[tuple[int, int]]:
+        walkable = self._walkable
+        while True:
+            y += dy
+            if not walkable(x, y):
+                return None
+            if (x, y) == self._goal:
+                return x, y
+            if self._jump_horizontal_4(x, y, 1) or self._jump_horizontal_4(x, y, -1):
+                return x, y
+
+    def _jump_8(self, x: int, y: int, dx: int, dy: int) -> Optional[tuple[int, int]]:
+        walkable = self._walkable
+        while True:
+            x += dx
+            y += dy
+            if not walkable(x, y):
+                return None
+            if (x, y) == self._goal:
+                return x, y
+
+            if dx != 0 and dy != 0:
+                if (not walkable(x - dx, y) and walkable(x - dx, y + dy)) \
+                        or (not walkable(x, y - dy) and walkable(x + dx, y - dy)):
+                    return x, y
+                if self._jump_8(x, y, dx, 0) or self._jump_8(x, y, 0, dy):
+                    return x, y
+            elif dx != 0:
+                if (not walkable(x, y - 1) and walkable(x + dx, y - 1)) \
+                        or (not walkable(x, y + 1) and walkable(x + dx, y + 1)):
+                    return x, y
+            else:
+                if (not walkable(x - 1, y) and walkable(x - 1, y + dy)) \
+                        or (not walkable(x + 1, y) and walkable(x + 1, y + dy)):
+                    return x, y
+
+
+def _expand_path(grid: Grid, jump_points: list[int]) -> list[int]:
+    path = jump_points[:1]
+    for a, b in zip(jump_points, jump_points[1:]):
+        (ax, ay), (bx, by) = grid.coords(a), grid.coords(b)
+        dx, dy = _sign(bx - ax), _sign(by - ay)
+        while (ax, ay) != (bx, by):
+            ax += dx
+            ay += dy
+            path.append(grid.index(ax, ay))
+    return path
+
+
+def jump_point_search(grid: Grid, start: int, goal: int, heuristic: Optional[Heuristic] = None, \
+                      diagonals: Optional[bool] = None, observer: Optional[ISearchObserver] = None) -> SearchResult:
+    return run_steps(jump_point_search_steps(grid, start, goal, heuristic, diagonals, observer))
+
+
+def jump_point_search_steps(grid: Grid, start: int, goal: int, heuristic: Optional[Heuristic] = None, \
+                            diagonals: Optional[bool] = None, \
+                            observer: Optional[ISearchObserver] = None) -> SearchSteps:
+    if diagonals is None:
+        diagonals = grid.diagonals
+
+    if heuristic is None:
+        heuristic = get_heuristic(default_heuristic(diagonals))
+
+    # Jumping over a straight run assumes every cell on it costs the same to cross, and the pruning
+    # rules for diagonals assume they may cut any corner
+    if grid.has_terrain() or (diagonals and grid.diagonal_rule != DiagonalRule.ALWAYS):
+        return (yield from search_steps(grid, start, goal, heuristic, diagonals, observer))
+
+    width, height = grid.width, grid.height
+    is_passable = grid.is_passable
+
+    def walkable(x: int, y: int) -> bool:
+        return 0 <= x < width and 0 <= y < height and is_passable(y * width + x)
+
+    gx, gy = grid.coords(goal)
+    jumper = _Jumper(walkable, (gx, gy), diagonals)
+    stats = SearchStats()
+    began = perf_counter()
+
+    best_g = array('d', [inf]) * grid.size
+    parents = array('l', [-1]) * grid.size
+    closed = bytearray(grid.size)
+    counter = 0
+
+    sx, sy = grid.coords(start)
+    h = heuristic(abs(sx - gx), abs(sy - gy))
+    best_g[start] = 0.0
+    parents[start] = start
+    openlist: list[tuple[float, float, int, int]] = [(h, h, counter, start)]
+    stats.pushes += 1
+
+    while openlist:
+        if len(openlist) > stats.peak_open:
+            stats.peak_open = len(openlist)
+        current = heappop(openlist)[3]
+        stats.pops += 1
+
+        if closed[current]:
+            stats.stale += 1
+            continue
+
+        closed[current] = 1
+        if current == goal:
+            path = _expand_path(grid, trace_path(parents, start, goal))
+
+            stats.time = perf_counter() - began
+            if observer:
+                observer.on_path(path)
+            return SearchResult(path, best_g[goal], stats)
+
+        stats.expanded += 1
+        if observer:
+            observer.on_expand(current)
+        yield stats
+
+        y, x = divmod(current, width)
+        py, px = divmod(parents[current], width)
+        g = best_g[current]
+        for dx, dy in jumper.successors(x, y, _sign(x - px), _sign(y - py)):
+            jump_point = jumper.jump(x, y, dx, dy)
+            if jump_point is None:
+                continue
+
+            nx, ny = jump_point
+            neighbor = ny * width + nx
+            if closed[neighbor]:
+                continue
+
+            steps = max(abs(nx - x), abs(ny - y))
+            ng = g + steps * (_SQRT2 if dx != 0 and dy != 0 else 1)
+            if ng >= best_g[neighbor]:
+                continue
+
+            best_g[neighbor] = ng
+            parents[neighbor] = current
+            nh = heuristic(abs(nx - gx), abs(ny - gy))
+            counter += 1
+            heappush(openlist, (ng + nh, nh, counter, neighbor))
+            stats.pushes += 1
+
+    stats.time = perf_counter() - began
+    return SearchResult(None, 0.0, stats)
@@ -0,0 +1,77 @@
+from typing import Callable, Final, Optional, Protocol
+
+from a_star.bidirectional import bidirectional_search, bidirectional_search_steps
+from a_star.contraction import ContractedPlanner
+from a_star.engine import ISearchObserver, SearchResult, SearchSteps, search, search_steps
+from a_star.heuristics import Heuristic
+from a_star.hierarchical import HierarchicalPlanner
+from a_star.incremental import IncrementalPlanner
+from a_star.jps import jump_point_search, jump_point_search_steps
+from errors import InvalidArgValueError
+from models import Grid
+
+type SearchMode = Callable[[Grid, int, int, Optional[Heuristic], Optional[bool], Optional[ISearchObserver]], SearchResult]
+type SteppedSearchMode = Callable[[Grid, int, int, Optional[Heuristic], Optional[bool], Optional[ISearchObserver]], \
+                                  SearchSteps]
+type PlannerFactory = Callable[[Grid], IPlanner]
+
+
+# A search mode bound to one grid, which it listens to until closed
+class IPlanner(Protocol):
+    def __call__(self, grid: Grid, start: int, goal: int, heuristic: Optional[Heuristic] = None, \
+                 diagonals: Optional[bool] = None, observer: Optional[ISearchObserver] = None) -> SearchResult:
+        pass
+
+    def close(self) -> None:
+        pass
+
+SEARCH_MODES: Final[dict[str, SearchMode]] = {
+    'a*': search,
+    'bidirectional': bidirectional_search,
+    'jps': jump_point_search,
+}
+
+
+# Generator versions of the search modes, which the UI runs a frame's budget at a time
+STEPPED_SEARCH_MODES: Final[dict[str, SteppedSearchMode]] = {
+    'a*': search_steps,
+    'bidirectional': bidirectional_search_steps,
+    'jps': jump_point_search_steps,
+}
+
+
+# Modes that keep state between queries on the same grid; one planner is built per grid
+PLANNERS: Final[dict[str, PlannerFactory]] = {
+    'lpa*': IncrementalPlanner,
+    'hpa*': HierarchicalPlanner,
+    'corridors': ContractedPlanner,
+}
+
+
+# Modes whose paths may be longer than the shortest; their results are not cached
+APPROXIMATE_MODES: Final[frozenset[str]] = frozenset(('hpa*',))
+
+
+def mode_names() -> list[str]:
+    return [*SEARCH_MODES, *PLANNERS]
+
+
+def get_search_mode(name: str) -> SearchMode:
+    if name not in SEARCH_MODES:
+        raise InvalidArgValueError(list(SEARCH_MODES), name)
+
+    return SEARCH_MODES[name]
+
+
+def get_stepped_search_mode(name: str) -> SteppedSearchMode:
+    if name not in STEPPED_SEARCH_MODES:
+        raise InvalidArgValueError(list(STEPPED_SEARCH_MODES), name)
+
+    return STEPPED_SEARCH_MODES[name]
+
+
+def create_planner(name: str, grid: Grid) -> IPlanner:
+    if name not in PLANNERS:
+        raise InvalidArgValueError(list(PLANNERS), name)
+
+    return PLANNERS[name](grid)
@@ -1,28 +1,36 @@
+import random
 import sys
-from heapq import heappop, heappush
-from math import sqrt
 from typing import Final, Optional
 
 import pygame
 from pygame.locals import *
 
+from a_star import cache, engine, fields, heuristics, modes, worker
+from enums import DiagonalRule, Terrain
 import maze
-from log import logging, timed
+from log import logging
 import models
 
-class PathFinder:
+class PathFinder(engine.ISearchObserver):
     FPS: Final[int] = 60
     LEFT_CLICK: Final[int] = 1
+    MIDDLE_CLICK: Final[int] = 2
     RIGHT_CLICK: Final[int] = 3
+    WEIGHTS: Final[tuple[float, ...]] = (1.0, 1.5, 2.0, 5.0)
+    SAVE_PATH: Final[str] = 'maze.pystar'
+    PATH_CACHE_SIZE: Final[int] = 64
+    # Random goals ranked by a one-to-many search, and agents sent down a distance field
+    MANY_GOALS: Final[int] = 8
+    FIELD_AGENTS: Final[int] = 8
+    # Keys that only change settings; any other input cancels a running search or maze generation
+    PASSIVE_INPUTS: Final[frozenset[int]] = frozenset((K_h, K_e, K_n, K_g))
+    CAPTION: Final[str] = 'PyStar'
+    # In drawing mode number keys pick the terrain brush and paint with it; the brush covers this
+    # many cells around the highlighted cell (or the middle-clicked one)
+    TERRAIN_KEYS: Final[dict[int, Terrain]] = {K_1: Terrain.PLAIN, K_2: Terrain.ROAD, K_3: Terrain.GRASS, \
+                                               K_4: Terrain.SAND, K_5: Terrain.MUD, K_6: Terrain.WATER}
+    BRUSH_RADIUS: Final[int] = 1
     
-    @staticmethod
-    def _get_distance(start, goal) -> float:
-        dx = float(start.x - goal.x)
-        dy = float(start.y - goal.y)
-        dist = float(sqrt(dx * dx + dy * dy))
-
-        return dist
-
     @staticmethod
     def _clamp(point: models.Point, max: models.Point, min: models.Point) -> models.Point:
         clampedPoint: list[int] = []
@@ -58,58 +66,232 @@ class PathFinder:
         self.pressed_keys: dict[int, pygame.event.Event] = {}
         self.is_drawing: bool = False
         self.diagonals: bool = diagonals
+        self.heuristic: str = heuristics.default_heuristic(diagonals)
+        self.weight: float = self.WEIGHTS[0]
+        self.mode: str = modes.mode_names()[0]
+        self._planners: dict[str, modes.IPlanner] = {}
+        self._path_cache: Optional[cache.PathCache] = None
+        self._worker = worker.BackgroundWorker()
+        self._search_progress: Optional[worker.SearchProgress] = None
+        self._search_query: Optional[tuple[str, int, int, str]] = None
+        self.generator: str = next(iter(maze.GENERATORS))
+        self.terrain_brush: Terrain = Terrain.PLAIN
         self.highlighted_cell: models.Point = models.Point(0, 0)  
         self.last_highlighted_cell: Optional[models.Point] = None
         self.window_dimensions = window_dimensions
         
         self._generate_maze()
-        self._handle_events()
     
-    @timed('PathFinder._find_path')
-    def _find_path(self, startEnd: models.StartEnd) -> Optional[list[models.Node]]:
+    def run(self) -> None:
+        pygame.display.set_caption(self.CAPTION)
+        self._handle_events()
+
+    def on_expand(self, index: int, reverse: bool = False) -> None:
+        cell = self.maze.cell(index)
+        if not cell.is_terminator():
+            if reverse:
+                cell.mark_as_searched_reverse()
+            else:
+                cell.mark_as_searched()
+
+    def on_path(self, path: list[int]) -> None:
+        for index in path:
+            cell = self.maze.cell(index)
+            if not cell.is_terminator():
+                cell.mark_as_route()
+
+    # Starts a search on the worker thread; its expansions are drawn as they arrive and the result
+    # is handled by _finish_search
+    def _find_path(self, startEnd: models.StartEnd) -> None:
         assert(startEnd.start is not None)
         assert(startEnd.end is not None)
-        
-        openlist: list[models.Node] = []
-        closedlist: set[models.Cell] = set()
-        
-        current = models.Node(cell=startEnd.start, parent=None, gCost=0, hCost=self._get_distance(startEnd.start, startEnd.end))
-        heappush(openlist, current)
 
-        while openlist:
-            current = heappop(openlist)
-            closedlist.add(current.cell)
-            
-            if current.cell.x == startEnd.end.x and current.cell.y == startEnd.end.y:
-                path = []
-                while current.parent is not None:
-                    if not current.cell.is_terminator():
-                        current.cell.mark_as_route()
-
-                    path.append(current)
-                    current = current.parent
-                return path
-
-            if not current.cell.is_terminator():
-                current.cell.mark_as_searched()
-
-            for cell in current.cell.neighbors:
-                if not cell.is_transversible() or cell in closedlist:
-                    continue
-                    
-                gcost = current.gCost + self._get_distance(current.cell, cell)
-                hcost = self._get_distance(cell, startEnd.end)
-                n = models.Node(cell, current, gcost, hcost)
-                heappush(openlist, n)
-
-            pygame.event.pump()
-        return None
+        self._cancel_jobs()
+        if not self.maze.components.connected(startEnd.start.index, startEnd.end.index):
+            self._logger.info(f'[{self.mode}] {startEnd.end} is unreachable from {startEnd.start}')
+            return
+
+        path_cache = self._get_path_cache()
+        heuristic_key = f'{self.heuristic} x{self.weight}'
+        result = path_cache.get(startEnd.start.index, startEnd.end.index, self.mode, heuristic_key, self.diagonals)
+        if result:
+            self.on_path(result.path or [])
+            self._logger.info(f'[{self.mode}, {heuristic_key}] cached path ({path_cache.hits} hits, ' \
+                              f'{path_cache.subpath_hits} sub-path hits, {path_cache.misses} misses)')
+            return
+
+        control = worker.JobControl()
+        progress = worker.SearchProgress(control)
+        steps = self._get_search_steps(startEnd.start.index, startEnd.end.index, progress)
+        self._search_progress = progress
+        self._search_query = (self.mode, startEnd.start.index, startEnd.end.index, heuristic_key)
+        self._worker.start(control, lambda: worker.run_search(steps, control), self._finish_search, shares_state=True)
+
+    def _draw_search_progress(self) -> None:
+        if self._search_progress:
+            for index, reverse in self._search_progress.take():
+                self.on_expand(index, reverse)
+
+    def _show_search_progress(self, event: pygame.event.Event) -> None:
+        if self._worker.is_current(event) and self._search_query:
+            pygame.display.set_caption(f'{self.CAPTION} - {self._search_query[0]}: {event.expanded} expanded, ' \
+                                       f'{event.frontier} open')
+
+    def _finish_search(self, result: engine.SearchResult) -> None:
+        assert self._search_progress is not None and self._search_query is not None
+
+        self._draw_search_progress()
+        if self._search_progress.path:
+            self.on_path(self._search_progress.path)
+
+        mode, start, goal, heuristic_key = self._search_query
+        self._search_progress = self._search_query = None
+        pygame.display.set_caption(self.CAPTION)
+        # Sub-paths of cached paths answer later queries in any mode, so only shortest paths are kept
+        if result.found and mode not in modes.APPROXIMATE_MODES:
+            self._get_path_cache().put(start, goal, mode, heuristic_key, self.diagonals, result)
+        self._logger.info(f'[{mode}, {heuristic_key}] expanded {result.stats.expanded} cells ' \
+                          f'in {result.stats.time * 1000:.1f}ms')
+        self._logger.debug(result)
+
+    def _cancel_jobs(self) -> None:
+        if not self._worker.busy:
+            return
+
+        self._worker.cancel()
+        pygame.display.set_caption(self.CAPTION)
+        if self._search_query:
+            mode = self._search_query[0]
+            # A planner stopped part way through a query may be left inconsistent
+            self._close_planners(mode)
+            self._logger.info(f'[{mode}] Search cancelled')
+        self._search_progress = self._search_query = None
+
+    def _get_search_steps(self, start: int, goal: int, observer: engine.ISearchObserver) -> engine.SearchSteps:
+        heuristic = heuristics.get_heuristic(self.heuristic, self.weight)
+        if self.mode in modes.STEPPED_SEARCH_MODES:
+            return modes.get_stepped_search_mode(self.mode)(self.maze.grid, start, goal, heuristic, self.diagonals, \
+                                                            observer)
+
+        return engine.single_step(self._get_search(), self.maze.grid, start, goal, heuristic, self.diagonals, observer)
+
+    # Ranks random goals reachable from the start by distance, settling all of them with one search
+    def _find_paths_to_many(self) -> None:
+        self._cancel_jobs()
+        self._reset_maze_colors()
+        if not self.startEnd.is_populated():
+            self._generate_random_start_end()
+        assert self.startEnd.start is not None and self.startEnd.end is not None
+
+        start = self.startEnd.start
+        try:
+            goals = [self.maze.get_random_transversible_point(connected_to=start).index for _ in range(self.MANY_GOALS)]
+        except IndexError:
+            self._logger.info(f'[one-to-many] Nothing is reachable from {start}')
+            return
+
+        goals.append(self.startEnd.end.index)
+        grid, diagonals = self.maze.grid, self.diagonals
+        control = worker.JobControl()
+        progress = self._search_progress = worker.SearchProgress(control)
+        self._worker.start(control, lambda: fields.one_to_many_search(grid, start.index, goals, diagonals, progress), \
+                           self._show_paths_to_many, shares_state=True)
+
+    def _show_paths_to_many(self, results: dict[int, engine.SearchResult]) -> None:
+        self._draw_search_progress()
+        self._search_progress = None
+
+        ranked = sorted((result.cost, goal) for goal, result in results.items() if result.found)
+        for _, goal in ranked:
+            self.on_path(results[goal].path or [])
+
+        stats = next(iter(results.values())).stats
+        self._logger.info(f'[one-to-many] {len(ranked)} of {len(results)} goals reached, expanded ' \
+                          f'{stats.expanded} cells in {stats.time * 1000:.1f}ms')
+        for rank, (cost, goal) in enumerate(ranked, 1):
+            self._logger.info(f'{rank}. {self.maze.cell(goal)} at {cost:.1f}')
+
+    # Distances from every cell to the end point, drawn as a heatmap, with a few agents following the field
+    def _compute_distance_field(self) -> None:
+        self._cancel_jobs()
+        self._reset_maze_colors()
+        if not self.startEnd.is_populated():
+            self._generate_random_start_end()
+        assert self.startEnd.end is not None
+
+        goal, grid, diagonals = self.startEnd.end.index, self.maze.grid, self.diagonals
+        control = worker.JobControl()
+        progress = self._search_progress = worker.SearchProgress(control)
+        self._worker.start(control, lambda: fields.DistanceField(grid, goal, diagonals, progress), \
+                           self._show_distance_field, shares_state=True)
+
+    def _show_distance_field(self, field: fields.DistanceField) -> None:
+        self._draw_search_progress()
+        self._search_progress = None
+        self.maze.show_heatmap(field.distances)
+
+        goal = self.maze.cell(field.goal)
+        for _ in range(self.FIELD_AGENTS):
+            try:
+                agent = self.maze.get_random_transversible_point(connected_to=goal)
+            except IndexError:
+                break
+            self.on_path(field.path_from(agent.index) or [])
+
+        self._logger.info(f'[distance field] {field.stats.expanded} cells to {goal} in ' \
+                          f'{field.stats.time * 1000:.1f}ms, {field.nbytes // 1024} KiB')
+
+    def _get_search(self) -> modes.SearchMode:
+        if self.mode in modes.SEARCH_MODES:
+            return modes.get_search_mode(self.mode)
+
+        if self.mode not in self._planners:
+            self._planners[self.mode] = modes.create_planner(self.mode, self.maze.grid)
+        return self._planners[self.mode]
+
+    # Planners listen to their grid; dropped ones are closed so its edits stop reaching them
+    def _close_planners(self, *names: str) -> None:
+        for name in names or list(self._planners):
+            planner = self._planners.pop(name, None)
+            if planner:
+                planner.close()
+
+    def _get_path_cache(self) -> cache.PathCache:
+        if self._path_cache is None or self._path_cache.grid is not self.maze.grid:
+            if self._path_cache:
+                self._path_cache.close()
+            self._path_cache = cache.PathCache(self.maze.grid, self.maze.components, self.PATH_CACHE_SIZE)
+        return self._path_cache
+
+    def _cycle_heuristic(self) -> None:
+        names = list(heuristics.HEURISTICS)
+        self.heuristic = names[(names.index(self.heuristic) + 1) % len(names)]
+        self._logger.info(f'Heuristic: {self.heuristic}')
+
+    def _cycle_mode(self) -> None:
+        names = modes.mode_names()
+        self.mode = names[(names.index(self.mode) + 1) % len(names)]
+        self._logger.info(f'Search mode: {self.mode}')
+
+    def _cycle_generator(self) -> None:
+        names = list(maze.GENERATORS)
+        self.generator = names[(names.index(self.generator) + 1) % len(names)]
+        self._logger.info(f'Maze generator: {self.generator}')
+
+    def _cycle_diagonal_rule(self) -> None:
+        rules = list(DiagonalRule)
+        self.maze.set_diagonal_rule(rules[(rules.index(self.maze.diagonal_rule) + 1) % len(rules)])
+        self._logger.info(f'Diagonal rule: {self.maze.diagonal_rule.value}' \
+                          + ('' if self.diagonals else ' (diagonals are off, so it has no effect)'))
+
+    def _cycle_weight(self) -> None:
+        self.weight = self.WEIGHTS[(self.WEIGHTS.index(self.weight) + 1) % len(self.WEIGHTS)]
+        self._logger.info(f'Heuristic weight: {self.weight}')
 
     def _generate_random_start_end(self) -> None:
         self.startEnd.reset()
-        self.startEnd.start, self.startEnd.end = \
-            (self.maze.get_random_transversible_point().mark_as_start(), \
-                self.maze.get_random_transversible_point().mark_as_end())
+        start, end = self.maze.get_random_connected_points()
+        self.startEnd.start, self.startEnd.end = start.mark_as_start(), end.mark_as_end()
         self._logger.debug(self.startEnd)
     
     def _reset_maze_colors(self, *, include_start_end=False) -> None:
@@ -119,24 +301,81 @@ class PathFinder:
             self.startEnd.reset()
 
     def _generate_maze(self) -> None:
-        self.maze.generate(self.cell_dimensions, self.diagonals)
+        self.maze.generate(self.cell_dimensions, self.diagonals, generator=maze.get_generator(self.generator))
+        self._close_planners()
+
+    # Carves on the worker thread; the maze is only replaced once the carving is done
+    def _start_maze_generation(self) -> None:
+        self._cancel_jobs()
+        cell_size, diagonals, seed = self.cell_dimensions, self.diagonals, random.randrange(2 ** 32)
+        name = self.generator
+        generator = maze.get_generator(name)
+
+        def fill(opened: bytearray) -> None:
+            self.maze.fill(cell_size, diagonals, seed, opened)
+            self._close_planners()
+            self._logger.info(f'Generated {name} maze with seed {seed}')
+
+        self._worker.start(worker.JobControl(), lambda: self.maze.carve(cell_size, diagonals, seed, generator), \
+                           fill, shares_state=False)
                 
+    def _save_maze(self) -> None:
+        # The highlighted cell would otherwise be saved as a wall
+        if self.last_highlighted_cell:
+            cell = self.maze.get_cell(self.last_highlighted_cell.x, self.last_highlighted_cell.y)
+            if cell:
+                cell.unhighlight()
+            self.last_highlighted_cell = None
+
+        header = self.maze.save(self.SAVE_PATH)
+        self._logger.info(f'Saved {header.width}x{header.height} maze to {self.SAVE_PATH}')
+
+    def _load_maze(self) -> None:
+        try:
+            self.maze.load(self.SAVE_PATH)
+        except (OSError, ValueError) as e:
+            self._logger.error(f'Could not load {self.SAVE_PATH}: {e}')
+            return
+
+        self.startEnd = models.StartEnd(None, None)
+        if self.maze.grid.diagonals != self.diagonals:
+            # The heuristic picked for the old connectivity may not suit the new one (manhattan
+            # overestimates once diagonal steps are allowed)
+            self.diagonals = self.maze.grid.diagonals
+            self.heuristic = heuristics.default_heuristic(self.diagonals)
+            self._logger.info(f'Diagonals {"on" if self.diagonals else "off"}, heuristic: {self.heuristic}')
+        self.highlighted_cell = models.Point(0, 0)
+        self.last_highlighted_cell = None
+        self._close_planners()
+        self._logger.info(f'Loaded {self.maze.grid.width}x{self.maze.grid.height} maze from {self.SAVE_PATH}')
+
     def _handle_events(self) -> None:
         while True:
             for event in pygame.event.get():
                 if event.type == QUIT:
+                    self._cancel_jobs()
                     pygame.quit()
                     sys.exit(0)
                 if event.type == MOUSEBUTTONDOWN:
                     self.pressed_keys[event.button] = event
                 if event.type == KEYDOWN:
                     self.pressed_keys[event.key] = event
+                if event.type == worker.PROGRESS_EVENT:
+                    self._show_search_progress(event)
+                if event.type == worker.DONE_EVENT:
+                    self._worker.finish(event)
+
+                if self.pressed_keys.keys() - self.PASSIVE_INPUTS:
+                    self._cancel_jobs()
 
                 self._compute_current_highlighted_cell()
                 self._handle_mouse_events()
                 self._handle_key_events()
                 self.pressed_keys.clear()
-                self._update_display()
+
+            # Drawing runs every frame, not just on frames with input
+            self._draw_search_progress()
+            self._update_display()
 
     def _handle_key_events(self) -> None:
         if K_z in self.pressed_keys:
@@ -144,7 +383,7 @@ class PathFinder:
             if self.is_drawing:
                 self.maze.reopen_cells(openable_only=False)
             else:
-                self._generate_maze()
+                self._start_maze_generation()
 
         if K_f in self.pressed_keys:
             self._reset_maze_colors()
@@ -154,11 +393,35 @@ class PathFinder:
             
             self._find_path(self.startEnd)
         
+        if K_o in self.pressed_keys:
+            self._find_paths_to_many()
+
+        if K_t in self.pressed_keys:
+            self._compute_distance_field()
+
+        if K_u in self.pressed_keys:
+            self._scatter_terrain()
+
+        if K_h in self.pressed_keys:
+            self._cycle_heuristic()
+
+        if K_e in self.pressed_keys:
+            self._cycle_weight()
+
+        if K_n in self.pressed_keys:
+            self._cycle_mode()
+
+        if K_g in self.pressed_keys:
+            self._cycle_generator()
+
+        if K_r in self.pressed_keys:
+            self._cycle_diagonal_rule()
+
         if K_p in self.pressed_keys:
             self._generate_random_start_end()
 
         if K_m in self.pressed_keys:
-            self._generate_maze()
+            self._start_maze_generation()
 
         if K_c in self.pressed_keys:
             self._reset_maze_colors(include_start_end=True)
@@ -166,6 +429,12 @@ class PathFinder:
         if K_x in self.pressed_keys:
             self._reset_maze_colors()
 
+        if K_F5 in self.pressed_keys:
+            self._save_maze()
+
+        if K_F9 in self.pressed_keys:
+            self._load_maze()
+
         if K_SPACE in self.pressed_keys:
             self.startEnd.progress(self.maze.get_cell(self.highlighted_cell.x, self.highlighted_cell.y))
 
@@ -178,18 +447,20 @@ class PathFinder:
         if not self.is_drawing:
             return
         
+        cell_size = self.maze.cell_size
         if K_d in self.pressed_keys or K_RIGHT in self.pressed_keys:
-            self.highlighted_cell.x += self.cell_dimensions.width
+            self.highlighted_cell.x += cell_size.width
         elif K_s in self.pressed_keys or K_DOWN in self.pressed_keys:
-            self.highlighted_cell.y += self.cell_dimensions.height
+            self.highlighted_cell.y += cell_size.height
         elif K_a in self.pressed_keys or K_LEFT in self.pressed_keys:
-            self.highlighted_cell.x -= self.cell_dimensions.width
+            self.highlighted_cell.x -= cell_size.width
         elif K_w in self.pressed_keys or K_RIGHT in self.pressed_keys:
-            self.highlighted_cell.y -= self.cell_dimensions.height
+            self.highlighted_cell.y -= cell_size.height
 
+        # Loaded mazes may not cover the whole window
         self.highlighted_cell = self._clamp(self.highlighted_cell, \
-                                            models.Point(self.window_dimensions.width - self.cell_dimensions.width, \
-                                                    self.window_dimensions.height - self.cell_dimensions.height),
+                                            models.Point((self.maze.grid.width - 1) * cell_size.width, \
+                                                    (self.maze.grid.height - 1) * cell_size.height),
                                              models.Point(0, 0))
         
         hcell: Optional[models.Cell] = self.maze.get_cell(self.highlighted_cell.x, self.highlighted_cell.y)
@@ -206,7 +477,30 @@ class PathFinder:
 
         if K_b in self.pressed_keys:
             hcell.mark_as_open()
+
+        for key, terrain in self.TERRAIN_KEYS.items():
+            if key in self.pressed_keys:
+                self.terrain_brush = terrain
+                self._paint_terrain(hcell)
+
+        if self.MIDDLE_CLICK in self.pressed_keys:
+            mouse_position = self._mouse_position()
+            mcell = self.maze.get_cell(mouse_position.x, mouse_position.y)
+            if mcell:
+                self._paint_terrain(mcell)
     
+    def _paint_terrain(self, cell: models.Cell) -> None:
+        grid = self.maze.grid
+        for y in range(cell.y - self.BRUSH_RADIUS, cell.y + self.BRUSH_RADIUS + 1):
+            for x in range(cell.x - self.BRUSH_RADIUS, cell.x + self.BRUSH_RADIUS + 1):
+                if grid.contains(x, y):
+                    grid.set_terrain(grid.index(x, y), self.terrain_brush)
+
+    def _scatter_terrain(self) -> None:
+        grid = self.maze.grid
+        grid.write_terrain(maze.scatter_terrain(grid.width, grid.height, random.Random()))
+        self._logger.info(f'Scattered terrain, cheapest step cost x{grid.min_cost()}')
+
     def _update_display(self) -> None:
         if self.is_drawing and self.last_highlighted_cell != self.highlighted_cell:
             cell_to_highlight = self.maze.get_cell(self.highlighted_cell.x, self.highlighted_cell.y)
@@ -218,12 +512,12 @@ class PathFinder:
                 assert cell_to_unhighlight, 'Could not find cell to unhighlight'
                 cell_to_unhighlight.unhighlight()
                 
-        new_surf = self.maze.draw_surf(self.window_dimensions.width, \
-                                        self.window_dimensions.height)
-        if new_surf is not None:
-            self._surf.blit(new_surf, (0, 0))
+        maze_surf, rects = self.maze.draw_surf()
+        for rect in rects:
+            self._surf.blit(maze_surf, rect, rect)
 
         self.last_highlighted_cell = self.highlighted_cell.copy()
         
-        pygame.display.flip()
+        if rects:
+            pygame.display.update(rects)
         self._fps.tick(self.FPS)
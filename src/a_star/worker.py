@@ -0,0 +1,138 @@
+import logging
+import threading
+from typing import Any, Callable, Final, Optional
+
+import pygame
+
+from a_star.engine import ISearchObserver, SearchResult, SearchSteps, SteppedSearch
+
+# Both are posted from the worker thread with the job's control attached; DONE_EVENT also carries
+# the job's result, or the error it failed with
+PROGRESS_EVENT: Final[int] = pygame.event.custom_type()
+DONE_EVENT: Final[int] = pygame.event.custom_type()
+# Seconds a search runs between two progress events
+PROGRESS_INTERVAL: Final[float] = 0.05
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobControl:
+    def __init__(self) -> None:
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    # Called by the job at points where it can stop
+    def check(self) -> None:
+        if self._cancelled.is_set():
+            raise JobCancelled()
+
+    def report(self, **progress: Any) -> None:
+        pygame.event.post(pygame.event.Event(PROGRESS_EVENT, control=self, **progress))
+
+
+# Runs one job at a time on a daemon thread. Jobs never touch what the main thread draws; they hand
+# their results back through the pygame event queue and the main thread applies them.
+class BackgroundWorker:
+    def __init__(self) -> None:
+        self._logger = logging.getLogger(BackgroundWorker.__name__)
+        self._control: Optional[JobControl] = None
+        self._thread: Optional[threading.Thread] = None
+        self._on_done: Optional[Callable[[Any], None]] = None
+        self._shares_state: bool = False
+
+    @property
+    def busy(self) -> bool:
+        return self._control is not None
+
+    # A job that reads state the main thread goes on to change (the grid, the planners) is waited
+    # for when cancelled, so it must check its control often; any other job is left to finish and
+    # its result dropped
+    def start[T](self, control: JobControl, job: Callable[[], T], on_done: Callable[[T], None], \
+                 shares_state: bool) -> None:
+        self.cancel()
+        self._control = control
+        self._on_done = on_done
+        self._shares_state = shares_state
+        self._thread = threading.Thread(target=self._run, args=(control, job), daemon=True)
+        self._thread.start()
+
+    def is_current(self, event: pygame.event.Event) -> bool:
+        return self._control is not None and event.control is self._control
+
+    # Hands a DONE_EVENT's result to the job's callback, unless the job has since been cancelled
+    def finish(self, event: pygame.event.Event) -> None:
+        if not self.is_current(event):
+            return
+
+        on_done = self._on_done
+        self._control = self._thread = self._on_done = None
+        if event.error is None and on_done:
+            on_done(event.result)
+
+    def cancel(self) -> None:
+        if self._control is None:
+            return
+
+        self._control.cancel()
+        if self._shares_state and self._thread:
+            self._thread.join()
+        self._control = self._thread = self._on_done = None
+
+    def _run(self, control: JobControl, job: Callable[[], Any]) -> None:
+        error: Optional[Exception] = None
+        result = None
+        try:
+            result = job()
+        except JobCancelled:
+            return
+        except Exception as e:
+            self._logger.exception('Background job failed')
+            error = e
+
+        pygame.event.post(pygame.event.Event(DONE_EVENT, control=control, result=result, error=error))
+
+
+# Observes a search on the worker thread: expansions are queued for the main thread to draw, and
+# the search stops at its next expansion (or planner build step) once the job is cancelled
+class SearchProgress(ISearchObserver):
+    def __init__(self, control: JobControl) -> None:
+        self._control = control
+        self._lock = threading.Lock()
+        self._expanded: list[tuple[int, bool]] = []
+        self.path: Optional[list[int]] = None
+
+    def on_expand(self, index: int, reverse: bool = False) -> None:
+        self._control.check()
+        with self._lock:
+            self._expanded.append((index, reverse))
+
+    def on_path(self, path: list[int]) -> None:
+        self.path = path
+
+    def on_progress(self) -> None:
+        self._control.check()
+
+    # Expansions since the last call
+    def take(self) -> list[tuple[int, bool]]:
+        with self._lock:
+            expanded, self._expanded = self._expanded, []
+        return expanded
+
+
+def run_search(steps: SearchSteps, control: JobControl) -> SearchResult:
+    search = SteppedSearch(steps)
+    while not search.step(PROGRESS_INTERVAL):
+        control.check()
+        if search.stats:
+            control.report(expanded=search.stats.expanded, frontier=search.stats.frontier)
+
+    assert search.result is not None
+    return search.result
@@ -0,0 +1,6 @@
+import os
+
+# The maze package pulls in pygame, whose import banner would end up in results written to stdout
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from batch.runner import *
\ No newline at end of file
@@ -0,0 +1,51 @@
+import argparse
+import logging
+import sys
+from time import perf_counter
+
+from a_star import heuristics, modes
+from batch.runner import FORMATS, BatchRunner, ResultWriter, read_queries, sample_queries
+from log import ColorfulStreamHandler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog='python -m batch', description='Run many path queries against a saved maze')
+    parser.add_argument('maze', help='maze file written by Maze.save or maze.stream_maze')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--queries', help='CSV file with one "start x,start y,goal x,goal y" query per line')
+    source.add_argument('--sample', type=int, help='number of random open start/goal pairs to run')
+    parser.add_argument('--seed', type=int, help='seed for --sample')
+    parser.add_argument('--mode', default='a*', choices=list(modes.SEARCH_MODES))
+    parser.add_argument('--heuristic', choices=list(heuristics.HEURISTICS))
+    parser.add_argument('--weight', type=float, default=1.0)
+    parser.add_argument('--workers', type=int, help='worker processes (default: one per core)')
+    parser.add_argument('--format', default='jsonl', choices=FORMATS)
+    parser.add_argument('--output', help='results file (default: stdout)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, handlers=[ColorfulStreamHandler(sys.stderr)])
+    logger = logging.getLogger('batch')
+
+    with BatchRunner(args.maze, args.mode, args.heuristic, args.weight, args.workers) as runner:
+        if args.queries:
+            with open(args.queries) as file:
+                queries = read_queries(runner.grid, file)
+        else:
+            queries = sample_queries(runner.grid, args.sample, args.seed)
+
+        out = open(args.output, 'w', newline='') if args.output else sys.stdout
+        try:
+            writer = ResultWriter(out, args.format)
+            began = perf_counter()
+            for result in runner.run(queries):
+                writer.write(result)
+            elapsed = perf_counter() - began
+        finally:
+            if out is not sys.stdout:
+                out.close()
+
+    logger.info(f'{len(queries)} queries on {runner.workers} workers in {elapsed:.2f}s ({len(queries) / elapsed:.1f} queries/s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+import csv
+import json
+import os
+import random
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass, fields
+from multiprocessing.shared_memory import SharedMemory
+from typing import Final, Iterable, Iterator, Optional, Self, TextIO
+
+import numpy as np
+
+from a_star import heuristics, modes
+from enums import State
+from errors import InvalidArgValueError
+from maze import MappedGrid
+from models import Grid
+
+FORMATS: Final[tuple[str, ...]] = ('csv', 'jsonl')
+# Queries are sent to the workers in chunks so per-task overhead stays small next to the searches
+CHUNK_SIZE: Final[int] = 16
+
+
+@dataclass
+class Query:
+    id: int
+    start: int
+    goal: int
+
+
+@dataclass
+class QueryResult:
+    id: int
+    start: int
+    goal: int
+    found: bool
+    length: int
+    cost: float
+    expanded: int
+    time: float
+
+
+# Set up once per worker process by _init_worker
+_shared: Optional[SharedMemory] = None
+_grid: Optional[Grid] = None
+_search: Optional[modes.SearchMode] = None
+_heuristic: Optional[heuristics.Heuristic] = None
+
+
+def _init_worker(name: str, width: int, height: int, diagonals: bool, mode: str, heuristic: str, weight: float) -> None:
+    global _shared, _grid, _search, _heuristic
+    _shared = SharedMemory(name)
+    cells = width * height
+    _grid = Grid(width, height, diagonals, states=_shared.buf[:cells], masks=_shared.buf[cells:2 * cells])
+    _search = modes.get_search_mode(mode)
+    _heuristic = heuristics.get_heuristic(heuristic, weight)
+
+
+def _run_queries(queries: list[Query]) -> list[QueryResult]:
+    assert _grid is not None and _search is not None
+    results = []
+    for query in queries:
+        result = _search(_grid, query.start, query.goal, _heuristic, _grid.diagonals, None)
+        results.append(QueryResult(query.id, query.start, query.goal, result.found, \
+                                   len(result.path) if result.path else 0, result.cost, \
+                                   result.stats.expanded, result.stats.time))
+    return results
+
+
+def sample_queries(grid: Grid, count: int, seed: Optional[int] = None) -> list[Query]:
+    opened = np.flatnonzero(np.frombuffer(grid.states, dtype=np.uint8) == State.OPEN.value)
+    if len(opened) == 0:
+        return []
+
+    rng = random.Random(seed)
+    return [Query(id, int(opened[rng.randrange(len(opened))]), int(opened[rng.randrange(len(opened))])) \
+            for id in range(count)]
+
+
+# One query per line as start x, start y, goal x, goal y
+def read_queries(grid: Grid, lines: Iterable[str]) -> list[Query]:
+    queries = []
+    for row in csv.reader(lines):
+        if not row:
+            continue
+
+        sx, sy, gx, gy = map(int, row)
+        if not grid.contains(sx, sy) or not grid.contains(gx, gy):
+            raise ValueError(f'Query {row} lies outside the {grid.width}x{grid.height} maze')
+        queries.append(Query(len(queries), grid.index(sx, sy), grid.index(gx, gy)))
+    return queries
+
+
+class ResultWriter:
+    def __init__(self, out: TextIO, format: str) -> None:
+        if format not in FORMATS:
+            raise InvalidArgValueError(list(FORMATS), format)
+
+        self._out = out
+        self._format = format
+        self._csv = csv.writer(out) if format == 'csv' else None
+        if self._csv:
+            self._csv.writerow([field.name for field in fields(QueryResult)])
+
+    def write(self, result: QueryResult) -> None:
+        if self._csv:
+            self._csv.writerow(asdict(result).values())
+        else:
+            self._out.write(json.dumps(asdict(result)) + '\n')
+
+
+class BatchRunner:
+    def __init__(self, path: str, mode: str = 'a*', heuristic: Optional[str] = None, \
+                 weight: float = 1.0, workers: Optional[int] = None) -> None:
+        # Fail before any process is started
+        modes.get_search_mode(mode)
+
+        with MappedGrid(path) as mapped:
+            self.width, self.height, self.diagonals = mapped.width, mapped.height, mapped.diagonals
+            states = mapped.unpack_states()
+
+        # The neighbour masks are built once and follow the states in the same block, rather than
+        # every worker building a private copy
+        cells = len(states)
+        self._shared = SharedMemory(create=True, size=max(1, 2 * cells))
+        self._shared.buf[:cells] = states
+        self._shared.buf[cells:2 * cells] = Grid(self.width, self.height, self.diagonals, states=states).neighbor_masks()
+        self._masks = self._shared.buf[cells:2 * cells]
+        self.grid = Grid(self.width, self.height, self.diagonals, states=self._shared.buf[:cells], masks=self._masks)
+        self.mode = mode
+        self.heuristic = heuristic or heuristics.default_heuristic(self.diagonals)
+        self.weight = weight
+        self.workers = workers or os.cpu_count() or 1
+        heuristics.get_heuristic(self.heuristic, weight)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        # The grid's views have to be released before the block can be closed
+        self.grid.states.release()
+        self._masks.release()
+        self._shared.close()
+        self._shared.unlink()
+
+    # Yields results as soon as each chunk finishes, so memory does not grow with the batch size;
+    # at most two chunks per worker are in flight at a time
+    def run(self, queries: Iterable[Query]) -> Iterator[QueryResult]:
+        chunks = self._chunks(queries)
+        with ProcessPoolExecutor(self.workers, initializer=_init_worker, \
+                                 initargs=(self._shared.name, self.width, self.height, self.diagonals, \
+                                           self.mode, self.heuristic, self.weight)) as pool:
+            pending: set[Future[list[QueryResult]]] = set()
+            in_flight = 2 * self.workers
+            for chunk in chunks:
+                pending.add(pool.submit(_run_queries, chunk))
+                if len(pending) >= in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from future.result()
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+
+    @staticmethod
+    def _chunks(queries: Iterable[Query]) -> Iterator[list[Query]]:
+        chunk: list[Query] = []
+        for query in queries:
+            chunk.append(query)
+            if len(chunk) == CHUNK_SIZE:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
@@ -0,0 +1,38 @@
+import logging
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+import maze
+from batch import BatchRunner, sample_queries
+from log import ColorfulStreamHandler
+
+SIZE = 300
+QUERIES = 64
+WORKERS = (1, 2, 4, 8)
+SEED = 0
+
+
+def run() -> None:
+    logger = logging.getLogger('benchmarks.batch')
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'batch.maze')
+        maze.stream_maze(path, SIZE, SIZE, seed=SEED)
+
+        baseline = None
+        for workers in WORKERS:
+            with BatchRunner(path, workers=workers) as runner:
+                queries = sample_queries(runner.grid, QUERIES, SEED)
+                began = perf_counter()
+                count = sum(1 for _ in runner.run(queries))
+                elapsed = perf_counter() - began
+
+            baseline = baseline or elapsed
+            logger.info(f'{workers} workers: {count} queries in {elapsed:.2f}s ({count / elapsed:.1f} queries/s, '
+                        f'{baseline / elapsed:.2f}x)')
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, handlers=[ColorfulStreamHandler(sys.stdout)])
+    run()
@@ -0,0 +1,49 @@
+import logging
+import random
+import sys
+from time import perf_counter
+
+import maze
+from a_star import ContractedPlanner, search
+from log import ColorfulStreamHandler
+from models import Dimensions
+
+CELL_SIZE = Dimensions(1, 1)
+SIZE = 1000
+GENERATORS = ('depth-first', 'kruskal', 'recursive-division')
+QUERIES = 5
+SEED = 0
+
+
+def run() -> None:
+    logger = logging.getLogger('benchmarks.contraction')
+    for name in GENERATORS:
+        random.seed(SEED)
+        m = maze.Maze(SIZE, SIZE)
+        m.generate(CELL_SIZE, False, SEED, maze.get_generator(name))
+        queries = [tuple(cell.index for cell in m.get_random_connected_points()) for _ in range(QUERIES)]
+
+        planner = ContractedPlanner(m.grid)
+        began = perf_counter()
+        planner.build(False)
+        logger.info(f'[{name}] {SIZE}x{SIZE}: contracted to {planner.node_count} nodes and {planner.edge_count} '
+                    f'edges in {perf_counter() - began:.2f}s')
+
+        flat_expanded = contracted_expanded = 0
+        flat_time = contracted_time = 0.0
+        for start, goal in queries:
+            flat = search(m.grid, start, goal)
+            contracted = planner(m.grid, start, goal)
+            assert abs(flat.cost - contracted.cost) < 1e-6
+            flat_expanded += flat.stats.expanded
+            contracted_expanded += contracted.stats.expanded
+            flat_time += flat.stats.time
+            contracted_time += contracted.stats.time
+
+        logger.info(f'[{name}] flat A* {flat_expanded} expansions in {flat_time:.2f}s, '
+                    f'contracted {contracted_expanded} expansions in {contracted_time:.2f}s')
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, handlers=[ColorfulStreamHandler(sys.stdout)])
+    run()
@@ -0,0 +1,38 @@
+import logging
+import random
+import sys
+
+import maze
+from a_star import search
+from enums import DiagonalRule
+from log import ColorfulStreamHandler
+from models import Dimensions
+
+CELL_SIZE = Dimensions(1, 1)
+SIZE = 500
+GENERATORS = ('caves', 'rooms')
+QUERIES = 10
+SEED = 0
+
+
+def run() -> None:
+    logger = logging.getLogger('benchmarks.diagonals')
+    for name in GENERATORS:
+        random.seed(SEED)
+        m = maze.Maze(SIZE, SIZE)
+        m.generate(CELL_SIZE, True, SEED, maze.get_generator(name))
+        queries = [tuple(cell.index for cell in m.get_random_connected_points()) for _ in range(QUERIES)]
+
+        for rule in DiagonalRule:
+            m.set_diagonal_rule(rule)
+            results = [search(m.grid, start, goal) for start, goal in queries]
+            found = [result for result in results if result.found]
+            logger.info(f'[{name}] {rule.value}: {m.components.count()} regions, {len(found)}/{QUERIES} found, '
+                        f'{sum(r.stats.expanded for r in results)} expansions in '
+                        f'{sum(r.stats.time for r in results):.2f}s, mean cost '
+                        f'{sum(r.cost for r in found) / max(len(found), 1):.1f}')
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, handlers=[ColorfulStreamHandler(sys.stdout)])
+    run()
@@ -0,0 +1,59 @@
+import logging
+import random
+import sys
+from time import perf_counter
+
+import maze
+from a_star import DistanceField, one_to_many_search, search
+from log import ColorfulStreamHandler
+from models import Dimensions
+
+CELL_SIZE = Dimensions(1, 1)
+SIZE = 500
+GENERATORS = ('depth-first', 'caves', 'rooms')
+GOALS = 32
+AGENTS = 1000
+SEED = 0
+
+
+def run() -> None:
+    logger = logging.getLogger('benchmarks.fields')
+    for name in GENERATORS:
+        random.seed(SEED)
+        m = maze.Maze(SIZE, SIZE)
+        m.generate(CELL_SIZE, False, SEED, maze.get_generator(name))
+        start = m.get_random_transversible_point()
+        goals = [m.get_random_transversible_point(connected_to=start).index for _ in range(GOALS)]
+
+        separate_time = 0.0
+        separate_expanded = 0
+        costs = {}
+        for goal in goals:
+            result = search(m.grid, start.index, goal)
+            separate_time += result.stats.time
+            separate_expanded += result.stats.expanded
+            costs[goal] = result.cost
+
+        results = one_to_many_search(m.grid, start.index, goals)
+        assert all(abs(results[goal].cost - cost) < 1e-6 for goal, cost in costs.items())
+        stats = next(iter(results.values())).stats
+        logger.info(f'[{name}] {GOALS} goals: {GOALS} A* searches {separate_expanded} expansions in '
+                    f'{separate_time:.2f}s, one-to-many {stats.expanded} expansions in {stats.time:.2f}s')
+
+        field = DistanceField(m.grid, start.index)
+        agents = [m.get_random_transversible_point(connected_to=start).index for _ in range(AGENTS)]
+        began = perf_counter()
+        steps = 0
+        for agent in agents:
+            while agent != field.goal:
+                agent = field.next_step(agent)
+                steps += 1
+        walk_time = perf_counter() - began
+        logger.info(f'[{name}] distance field of {SIZE}x{SIZE} in {field.stats.time:.2f}s '
+                    f'({field.nbytes // 1024} KiB); {AGENTS} agents walked {steps} steps in {walk_time:.2f}s '
+                    f'({walk_time / steps * 1e9:.0f}ns/step)')
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, handlers=[ColorfulStreamHandler(sys.stdout)])
+    run()
@@ -0,0 +1,27 @@
+import logging
+import sys
+from time import perf_counter
+
+import maze
+from log import ColorfulStreamHandler
+from models import Dimensions
+
+CELL_SIZE = Dimensions(1, 1)
+SIZES = (250, 500, 1000)
+SEED = 0
+
+
+def run() -> None:
+    logger = logging.getLogger('benchmarks.generate')
+    for name, generator in maze.GENERATORS.items():
+        for size in SIZES:
+            m = maze.Maze(size, size)
+            began = perf_counter()
+            m.generate(CELL_SIZE, False, SEED, generator)
+            elapsed = perf_counter() - began
+            logger.info(f'[{name}] {size}x{size}: generated in {elapsed:.3f}s ({size * size / elapsed:.0f} cells/s)')
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, handlers=[ColorfulStreamHandler(sys.stdout)])
+    run()
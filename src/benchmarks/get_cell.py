@@ -0,0 +1,28 @@
+import logging
+import random
+import sys
+from timeit import timeit
+
+import maze
+from log import ColorfulStreamHandler
+from models import Dimensions
+
+CELL_SIZE = Dimensions(1, 1)
+SIZES = (100, 500, 1000, 2000)
+LOOKUPS = 100_000
+
+
+def run() -> None:
+    logger = logging.getLogger('benchmarks.get_cell')
+    for size in SIZES:
+        m = maze.Maze(size, size)
+        m._generate_cells(CELL_SIZE, False)
+        points = [(random.randrange(size), random.randrange(size)) for _ in range(LOOKUPS)]
+
+        elapsed = timeit(lambda: [m.get_cell(x, y) for x, y in points], number=1)
+        logger.info(f'{size}x{size}: {elapsed / LOOKUPS * 1e9:.0f}ns per get_cell')
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, handlers=[ColorfulStreamHandler(sys.stdout)])
+    run()
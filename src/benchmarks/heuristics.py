@@ -0,0 +1,34 @@
+import logging
+import random
+import sys
+
+import maze
+from a_star import HEURISTICS, search
+from log import ColorfulStreamHandler
+from models import Dimensions
+
+CELL_SIZE = Dimensions(1, 1)
+SIZE = 300
+QUERIES = 20
+SEED = 0
+
+
+def run() -> None:
+    logger = logging.getLogger('benchmarks.heuristics')
+    for diagonals in (False, True):
+        random.seed(SEED)
+        m = maze.Maze(SIZE, SIZE)
+        m.generate(CELL_SIZE, diagonals, SEED)
+        queries = [(m.get_random_transversible_point().index, m.get_random_transversible_point().index) \
+                   for _ in range(QUERIES)]
+
+        for name, heuristic in HEURISTICS.items():
+            results = [search(m.grid, start, goal, heuristic) for start, goal in queries]
+            expanded = sum(result.stats.expanded for result in results)
+            cost = sum(result.cost for result in results)
+            logger.info(f'diagonals={diagonals} {name}: {expanded} expansions, total cost {cost:.1f}')
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, handlers=[ColorfulStreamHandler(sys.stdout)])
+    run()
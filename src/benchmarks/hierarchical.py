@@ -0,0 +1,65 @@
+import logging
+import random
+import sys
+from itertools import product
+from time import perf_counter
+
+import maze
+from a_star import HierarchicalPlanner, search
+from enums import State
+from log import ColorfulStreamHandler
+from models import Dimensions
+
+CELL_SIZE = Dimensions(1, 1)
+# The narrow shape is a single column of clusters
+SHAPES = (Dimensions(500, 500), Dimensions(12, 2000))
+GENERATORS = ('depth-first', 'caves', 'rooms')
+QUERIES = 10
+EDITS = 10
+SEED = 0
+
+
+def run() -> None:
+    logger = logging.getLogger('benchmarks.hierarchical')
+    for shape, name in product(SHAPES, GENERATORS):
+        label = f'{name} {shape.width}x{shape.height}'
+        random.seed(SEED)
+        m = maze.Maze(shape.width, shape.height)
+        m.generate(CELL_SIZE, False, SEED, maze.get_generator(name))
+        queries = [tuple(cell.index for cell in m.get_random_connected_points()) for _ in range(QUERIES)]
+
+        planner = HierarchicalPlanner(m.grid)
+        began = perf_counter()
+        planner.update(False)
+        logger.info(f'[{label}] abstract graph of {planner.node_count} nodes built in {perf_counter() - began:.2f}s')
+
+        flat_time = hierarchical_time = 0.0
+        gaps = []
+        missed = 0
+        for start, goal in queries:
+            flat = search(m.grid, start, goal)
+            hierarchical = planner(m.grid, start, goal)
+            flat_time += flat.stats.time
+            hierarchical_time += hierarchical.stats.time
+            if flat.found and not hierarchical.found:
+                missed += 1
+                continue
+            gaps.append(hierarchical.cost / flat.cost - 1 if flat.cost else 0.0)
+
+        logger.info(f'[{label}] flat A* {flat_time / QUERIES * 1000:.1f}ms/query, '
+                    f'HPA* {hierarchical_time / QUERIES * 1000:.1f}ms/query, '
+                    f'optimality gap mean {sum(gaps) / max(len(gaps), 1):.2%} '
+                    f'max {max(gaps, default=0.0):.2%}, {missed} reachable goals missed')
+
+        cells = [m.get_random_transversible_point() for _ in range(EDITS)]
+        began = perf_counter()
+        for cell in cells:
+            m.grid.set_state(cell.index, State.WALL)
+            planner.update(False)
+        logger.info(f'[{label}] {(perf_counter() - began) / EDITS * 1000:.1f}ms to update the abstract graph '
+                    f'per edit')
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, handlers=[ColorfulStreamHandler(sys.stdout)])
+    run()
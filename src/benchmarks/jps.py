@@ -0,0 +1,46 @@
+import logging
+import random
+import sys
+
+from a_star import jump_point_search, search
+from enums import State
+from log import ColorfulStreamHandler
+from models import Grid
+
+SIZES = (200, 500)
+WALLS = 40
+QUERIES = 10
+SEED = 0
+
+
+def _drawn_map(size: int, diagonals: bool) -> Grid:
+    grid = Grid(size, size, diagonals, fill=State.OPEN)
+    for _ in range(WALLS):
+        x, y = random.randrange(size), random.randrange(size)
+        horizontal = random.random() < 0.5
+        for step in range(random.randrange(size // 4, size // 2)):
+            wx, wy = (x + step, y) if horizontal else (x, y + step)
+            if grid.contains(wx, wy):
+                grid.states[grid.index(wx, wy)] = State.WALL.value
+    return grid
+
+
+def run() -> None:
+    logger = logging.getLogger('benchmarks.jps')
+    for size in SIZES:
+        for diagonals in (False, True):
+            random.seed(SEED)
+            grid = _drawn_map(size, diagonals)
+            open_cells = [index for index in range(grid.size) if grid.is_passable(index)]
+            queries = [(random.choice(open_cells), random.choice(open_cells)) for _ in range(QUERIES)]
+
+            for name, find in (('a*', search), ('jps', jump_point_search)):
+                results = [find(grid, start, goal) for start, goal in queries]
+                expanded = sum(result.stats.expanded for result in results)
+                elapsed = sum(result.stats.time for result in results)
+                logger.info(f'{size}x{size} diagonals={diagonals} {name}: {expanded} expansions in {elapsed:.3f}s')
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, handlers=[ColorfulStreamHandler(sys.stdout)])
+    run()
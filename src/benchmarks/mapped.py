@@ -0,0 +1,48 @@
+import logging
+import os
+import random
+import sys
+import tempfile
+from time import perf_counter
+
+import maze
+from a_star import search
+from log import ColorfulStreamHandler
+from models import Grid
+
+SIZE = 1000
+QUERIES = 5
+SEED = 0
+
+
+def run() -> None:
+    logger = logging.getLogger('benchmarks.mapped')
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'mapped.maze')
+        maze.stream_maze(path, SIZE, SIZE, seed=SEED)
+
+        began = perf_counter()
+        mapped = maze.MappedGrid(path)
+        logger.info(f'{SIZE}x{SIZE}: mapped in {(perf_counter() - began) * 1000:.2f}ms')
+
+        began = perf_counter()
+        grid = Grid(SIZE, SIZE, False)
+        grid.write_states(mapped.unpack_states())
+        logger.info(f'{SIZE}x{SIZE}: unpacked into memory in {(perf_counter() - began) * 1000:.2f}ms')
+
+        rng = random.Random(SEED)
+        opened = [index for index in range(grid.size) if grid.is_passable(index)]
+        for _ in range(QUERIES):
+            start, goal = rng.choice(opened), rng.choice(opened)
+            in_memory = search(grid, start, goal)
+            on_disk = search(mapped, start, goal)
+            assert in_memory.cost == on_disk.cost
+            logger.info(f'{start} -> {goal}: in memory {in_memory.stats.time * 1000:.0f}ms, '
+                        f'mapped {on_disk.stats.time * 1000:.0f}ms ({on_disk.stats.expanded} expanded)')
+
+        mapped.close()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, handlers=[ColorfulStreamHandler(sys.stdout)])
+    run()
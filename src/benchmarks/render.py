@@ -0,0 +1,39 @@
+import logging
+import os
+import random
+import sys
+from timeit import timeit
+
+import pygame
+
+import maze
+from enums import State
+from log import ColorfulStreamHandler
+from models import Dimensions
+
+SIZES = (500, 1000, 2000)
+CELL_SIZE = Dimensions(1, 1)
+REPEATS = 5
+
+
+def run() -> None:
+    logger = logging.getLogger('benchmarks.render')
+    for size in SIZES:
+        m = maze.Maze(size, size)
+        m._generate_cells(CELL_SIZE, False)
+        m.grid.states[:] = bytes(random.choice((State.OPEN.value, State.WALL.value)) for _ in range(m.grid.size))
+        m.draw_surf()
+
+        def repaint() -> None:
+            m.reopen_cells()
+            m.draw_surf()
+
+        elapsed = timeit(repaint, number=REPEATS) / REPEATS
+        logger.info(f'{size}x{size}: full repaint in {elapsed * 1000:.1f}ms')
+
+
+if __name__ == '__main__':
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    logging.basicConfig(level=logging.INFO, handlers=[ColorfulStreamHandler(sys.stdout)])
+    pygame.init()
+    run()
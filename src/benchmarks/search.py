@@ -0,0 +1,40 @@
+import logging
+import random
+import sys
+
+import maze
+from a_star import SEARCH_MODES
+from log import ColorfulStreamHandler
+from models import Dimensions
+
+CELL_SIZE = Dimensions(1, 1)
+SIZES = (500, 2000)
+QUERIES = 5
+SEED = 0
+
+
+def run() -> None:
+    logger = logging.getLogger('benchmarks.search')
+    for size in SIZES:
+        random.seed(SEED)
+        m = maze.Maze(size, size)
+        m.generate(CELL_SIZE, False, SEED)
+
+        queries = [(m.get_random_transversible_point().index, m.get_random_transversible_point().index) \
+                   for _ in range(QUERIES)]
+
+        for name, search in SEARCH_MODES.items():
+            expanded = 0
+            elapsed = 0.0
+            for start, goal in queries:
+                result = search(m.grid, start, goal, None, None, None)
+                expanded += result.stats.expanded
+                elapsed += result.stats.time
+
+            logger.info(f'{size}x{size} {name}: {expanded} expansions in {elapsed:.3f}s ' \
+                        f'({expanded / elapsed:.0f} expansions/s)')
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, handlers=[ColorfulStreamHandler(sys.stdout)])
+    run()
@@ -0,0 +1,36 @@
+import logging
+import os
+import sys
+import tempfile
+import tracemalloc
+from time import perf_counter
+
+import maze
+from log import ColorfulStreamHandler
+
+SIZES = ((1000, 1000), (1000, 4000), (4000, 1000))
+SEED = 0
+
+
+def run() -> None:
+    logger = logging.getLogger('benchmarks.stream')
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'stream.maze')
+        for width, height in SIZES:
+            began = perf_counter()
+            header = maze.stream_maze(path, width, height, seed=SEED)
+            elapsed = perf_counter() - began
+
+            # Traced separately, tracemalloc slows allocation-heavy code down several times
+            tracemalloc.start()
+            maze.stream_maze(path, width, height, seed=SEED)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            logger.info(f'{width}x{height}: streamed in {elapsed:.3f}s ({width * height / elapsed:.0f} cells/s), '
+                        f'{header.file_size / 1024:.0f}KiB on disk, peak memory {peak / 1024:.0f}KiB')
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, handlers=[ColorfulStreamHandler(sys.stdout)])
+    run()
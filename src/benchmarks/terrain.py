@@ -0,0 +1,39 @@
+import logging
+import random
+import sys
+
+import maze
+from a_star import get_heuristic, search
+from log import ColorfulStreamHandler
+from models import Dimensions
+
+CELL_SIZE = Dimensions(1, 1)
+SIZE = 500
+GENERATORS = ('caves', 'rooms')
+QUERIES = 10
+SEED = 0
+
+
+def run() -> None:
+    logger = logging.getLogger('benchmarks.terrain')
+    for name in GENERATORS:
+        random.seed(SEED)
+        m = maze.Maze(SIZE, SIZE)
+        m.generate(CELL_SIZE, False, SEED, maze.get_generator(name))
+        queries = [tuple(cell.index for cell in m.get_random_connected_points()) for _ in range(QUERIES)]
+
+        plain = [search(m.grid, start, goal) for start, goal in queries]
+        m.grid.write_terrain(maze.scatter_terrain(SIZE, SIZE, random.Random(SEED)))
+        weighted = [search(m.grid, start, goal) for start, goal in queries]
+        dijkstra = [search(m.grid, start, goal, get_heuristic('zero')) for start, goal in queries]
+        assert all(abs(a.cost - b.cost) < 1e-6 for a, b in zip(weighted, dijkstra))
+
+        for label, results in (('plain', plain), ('terrain', weighted), ('terrain, no heuristic', dijkstra)):
+            logger.info(f'[{name}] {label}: {sum(r.stats.expanded for r in results)} expansions in '
+                        f'{sum(r.stats.time for r in results):.2f}s, mean cost '
+                        f'{sum(r.cost for r in results) / QUERIES:.1f}')
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, handlers=[ColorfulStreamHandler(sys.stdout)])
+    run()
@@ -53,9 +53,21 @@ class Screen:
         self._console.out('m - Re-Generate Maze')
         self._console.out('f - Find path with current maze (start and end points will be generated if not done so already)')
         self._console.out('p - Generate random start and end points')
+        self._console.out('o - Rank random goals reachable from the start point with one search')
+        self._console.out('t - Draw a distance field to the end point as a heatmap, with agents following it')
         self._console.out('c - Clear maze colors and reset start and end points')
         self._console.out('x - Clear path, but not start and end colors')
         self._console.out('z - Toggle drawboard')
+        self._console.out('1-6 - In drawboard, paint terrain (plain, road, grass, sand, mud, water) around the cursor; middle click paints with the last one')
+        self._console.out('u - Scatter random terrain over the maze')
+        self._console.out('h - Cycle A* heuristic (manhattan, octile, chebyshev, euclidean, zero)')
+        self._console.out('e - Cycle heuristic weight (weighted A*)')
+        self._console.out('n - Cycle search mode (A*, bidirectional, jump point search, incremental LPA*, hierarchical HPA*, corridor-contracted)')
+        self._console.out('r - Cycle when diagonal moves may cut corners (always, if one side is free, never)')
+        self._console.out('g - Cycle maze generator (depth-first, Kruskal, Prim, Wilson, Eller, recursive division, caves, rooms)')
+        self._console.out('F5 - Save maze to maze.pystar')
+        self._console.out('F9 - Load maze from maze.pystar')
+        self._console.out('Searches and maze generation run in the background; any key but h, e, n and g cancels them')
         
     def _get_diagonals(self) -> bool:
         while True:
@@ -1,2 +1,4 @@
 from enums.state import *
-from enums.color import *
\ No newline at end of file
+from enums.color import *
+from enums.terrain import *
+from enums.diagonal_rule import *
@@ -6,7 +6,11 @@ class Color(Enum):
     START = (0, 0, 255)
     END = (255, 20, 147)
     SEARCHED = (255, 0, 0)
+    SEARCHED_REVERSE = (255, 165, 0)
     ROUTE = (0, 255, 0)
     OPEN = (255, 255, 255)
     WALL = (0, 0, 0)
     HIGHLIGHTED = (0, 255, 0)
+    # Ends of the terrain ramp; plain terrain is drawn as OPEN
+    CHEAP_TERRAIN = (128, 128, 128)
+    COSTLY_TERRAIN = (101, 67, 33)
@@ -0,0 +1,25 @@
+from enum import Enum
+
+import numpy as np
+
+
+# When a diagonal step may pass between the two cells beside it
+class DiagonalRule(Enum):
+    # Even squeezing between two walls
+    ALWAYS = 'always'
+    # Only if at least one of the two cells is free
+    ONE_SIDE_FREE = 'one-side-free'
+    # Only if both cells are free, so a path never clips a wall's corner
+    NO_CORNERS = 'no-corners'
+
+    # Bitwise, so it also works elementwise on numpy arrays
+    def allows(self, first_free: bool | np.ndarray, second_free: bool | np.ndarray) -> bool | np.ndarray:
+        match self:
+            case DiagonalRule.ALWAYS:
+                return True
+            case DiagonalRule.ONE_SIDE_FREE:
+                return first_free | second_free
+            case DiagonalRule.NO_CORNERS:
+                return first_free & second_free
+            case _:
+                raise ValueError('Invalid diagonal rule')
@@ -11,13 +11,17 @@ class State(Enum):
     OPEN = 5
     WALL = 6
     HIGHLIGHTED = 7
+    SEARCHED_REVERSE = 8
 
     def is_openable(self) -> bool:
-        return self in (State.SEARCHED, State.ROUTE)
+        return self in (State.SEARCHED, State.SEARCHED_REVERSE, State.ROUTE)
 
     def is_transversible(self) -> bool:
         return self.is_terminator() or self == State.OPEN
 
+    def is_passable(self) -> bool:
+        return self not in (State.WALL, State.HIGHLIGHTED)
+
     def is_terminator(self) -> bool:
         return self in (State.START, State.END)
 
@@ -29,11 +33,15 @@ class State(Enum):
                 return Color.END.value
             case State.SEARCHED:
                 return Color.SEARCHED.value
+            case State.SEARCHED_REVERSE:
+                return Color.SEARCHED_REVERSE.value
             case State.ROUTE:
                 return Color.ROUTE.value
             case State.OPEN:
                 return Color.OPEN.value
             case State.WALL:
                 return Color.WALL.value
+            case State.HIGHLIGHTED:
+                return Color.HIGHLIGHTED.value
             case _:
                 raise ValueError('Invalid state')
\ No newline at end of file
@@ -0,0 +1,28 @@
+from enum import Enum
+
+
+# Movement cost multipliers; a step costs its length times the mean multiplier of the two cells
+class Terrain(Enum):
+    PLAIN = 0
+    ROAD = 1
+    GRASS = 2
+    SAND = 3
+    MUD = 4
+    WATER = 5
+
+    def cost(self) -> float:
+        match self:
+            case Terrain.PLAIN:
+                return 1.0
+            case Terrain.ROAD:
+                return 0.5
+            case Terrain.GRASS:
+                return 1.5
+            case Terrain.SAND:
+                return 2.0
+            case Terrain.MUD:
+                return 3.0
+            case Terrain.WATER:
+                return 5.0
+            case _:
+                raise ValueError('Invalid terrain')
@@ -9,7 +9,7 @@ def main():
     logging.basicConfig(level=logging.DEBUG, handlers=[ColorfulStreamHandler(sys.stdout)])
     pygame.init()
     s = Screen().setup()
-    PathFinder(s.surf, s.cell_dimensions, s.window_dimensions, s.diagonals)
+    PathFinder(s.surf, s.cell_dimensions, s.window_dimensions, s.diagonals).run()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -1 +1,14 @@
-from maze.depth_first import *
\ No newline at end of file
+from maze.generator import *
+from maze.depth_first import *
+from maze.kruskal import *
+from maze.prim import *
+from maze.wilson import *
+from maze.eller import *
+from maze.recursive_division import *
+from maze.caves import *
+from maze.rooms import *
+from maze.algorithms import *
+from maze.storage import *
+from maze.terrain import *
+from maze.maze import *
+from maze.palette import *
\ No newline at end of file
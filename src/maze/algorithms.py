@@ -0,0 +1,30 @@
+from typing import Final
+
+from errors import InvalidArgValueError
+from maze.caves import Caves
+from maze.depth_first import DepthFirst
+from maze.eller import Eller
+from maze.generator import MazeGenerator
+from maze.kruskal import Kruskal
+from maze.prim import Prim
+from maze.recursive_division import RecursiveDivision
+from maze.rooms import Rooms
+from maze.wilson import Wilson
+
+GENERATORS: Final[dict[str, MazeGenerator]] = {
+    'depth-first': DepthFirst(),
+    'kruskal': Kruskal(),
+    'prim': Prim(),
+    'wilson': Wilson(),
+    'eller': Eller(),
+    'recursive-division': RecursiveDivision(),
+    'caves': Caves(),
+    'rooms': Rooms(),
+}
+
+
+def get_generator(name: str) -> MazeGenerator:
+    if name not in GENERATORS:
+        raise InvalidArgValueError(list(GENERATORS), name)
+
+    return GENERATORS[name]
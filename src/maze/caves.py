@@ -0,0 +1,26 @@
+import random
+from typing import override
+
+import numpy as np
+
+from maze.generator import MazeGenerator
+
+
+class Caves(MazeGenerator):
+    def __init__(self, fill: float = 0.45, iterations: int = 4) -> None:
+        self._fill = fill
+        self._iterations = iterations
+
+    @override
+    def carve(self, width: int, height: int, diagonals: bool, rng: random.Random) -> bytearray:
+        noise = np.random.default_rng(rng.getrandbits(64))
+        walls = noise.random((height, width)) < self._fill
+
+        # 4-5 cellular automaton: a cell becomes wall when at least 5 cells of its 3x3 block are walls,
+        # with everything outside the grid counting as wall
+        for _ in range(self._iterations):
+            padded = np.pad(walls, 1, constant_values=True).astype(np.uint8)
+            count = sum(padded[dy:dy + height, dx:dx + width] for dy in range(3) for dx in range(3))
+            walls = count >= 5
+
+        return bytearray((~walls).astype(np.uint8).tobytes())
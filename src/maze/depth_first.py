@@ -1,101 +1,52 @@
 import random
-import pygame.sprite
-
-from log import timed
-from models import Cell, Dimensions, ICellStateListener
-
-
-class Maze(ICellStateListener):
-    def __init__(self, width: int, height: int) -> None:
-        self._width: int = width
-        self._height: int = height
-        self._cells: list[list[Cell]] = []
-        self._needs_write: bool = False
-    
-    @timed('Maze.generate')
-    def generate(self, cell_size: Dimensions, diagonals: bool) -> None:
-        self._generate_cells(cell_size, diagonals)
-        self._populate_cells()
-
-    def draw_surf(self, width: int, height: int) -> pygame.Surface | None:
-        if not self._needs_write:
-            return None
-
-        surf = pygame.Surface((width, height))
-        for column in self._cells:
-            for cell in column:
-                pygame.draw.rect(surf, cell.get_color(), \
-                    (cell.x * cell.dimensions.width, \
-                    cell.y*cell.dimensions.height, \
-                    cell.dimensions.width, cell.dimensions.height))
-        
-        self._needs_write = False
-        
-        return surf
-
-    def reopen_cells(self, openable_only: bool=True) -> None:
-        for column in self._cells:
-            for cell in column:
-                if cell.is_openable() or not openable_only:
-                    cell.mark_as_open()
-         
-    def get_random_transversible_point(self) -> Cell:
-        all_cells = [row for row in self._cells for cell in row if cell.is_transversible()]
-        random.shuffle(all_cells)
-        return random.choice(random.choice(all_cells))
-       
-    def get_cell(self, x: int, y: int) -> Cell | None:
-        for row in self._cells:
-            for cell in row:
-                if cell.x == int((x / self._height)) \
-                        and cell.y == int((y / self._width)):
-                    return cell
-        
-        return None
-                
-    def on_cell_state_change(self) -> None:
-        self._needs_write = True
-       
-    def _populate_cells(self) -> None:
-        unvisited_cells = set([cell for column in self._cells for cell in column])
-        stack: list[Cell] = []
-        current = self._cells[0][0]
-
-        while unvisited_cells:
-            current.mark_as_open()
-            if current in unvisited_cells:
-                unvisited_cells.remove(current)
-
-            neighbors = current.get_unvisited_neighbors()
-            if len(neighbors) > 0:
-                stack.append(current)
-                current = random.choice(neighbors)
-            elif len(stack) > 0:
-                current = stack.pop()
-            else:
-                break
-
-    def _generate_cells(self, cell_size: Dimensions, diagonals: bool) -> None:
-        w = int(self._width / cell_size.width)
-        h = int(self._height / cell_size.height)
-        self._cells = [[Cell(row, column, cell_size, self)
-                      for row in range(h)]
-                      for column in range(w)]
-        
-        for row in range(h):
-            for column in range(w):
-                u = (row - 1, column) if 0 <= row - 1 < h else None
-                d = (row + 1, column) if 0 <= row + 1 < h else None
-                r = (row, column + 1) if 0 <= column + 1 < w else None
-                l = (row, column - 1) if 0 <= column - 1 < w else None
-
-                if diagonals:
-                    u_r = (row - 1, column + 1) if 0 <= row - 1 < h and 0 <= column + 1 < w else None
-                    d_r = (row + 1, column + 1) if 0 <= row + 1 < h and 0 <= column + 1 < w else None
-                    u_l = (row - 1, column - 1) if 0 <= row - 1 < h and 0 <= column - 1 < w else None
-                    d_l = (row + 1, column - 1) if 0 <= row + 1 < h and 0 <= column - 1 < w else None
-                    n = [u, d, l, r, u_r, d_r, u_l, d_l]
-                else:
-                    n = [u, d, l, r]
-
-                self._cells[row][column].neighbors = [self._cells[coords[0]][coords[1]] for coords in n if coords]
\ No newline at end of file
+from typing import Final, override
+
+from maze.generator import OPEN, WALL, MazeGenerator
+from models import Grid
+
+_BORDER: Final[int] = 2
+
+
+def carve_depth_first(width: int, height: int, diagonals: bool, rng: random.Random) -> bytearray:
+    # Randomized depth-first search over a bordered byte grid, so neighbour offsets never need bounds
+    # checks. A wall cell may be opened only if the current cell is its single open neighbour.
+    stride = width + 2
+    cells = bytearray([_BORDER]) * (stride * (height + 2))
+    for y in range(1, height + 1):
+        cells[y * stride + 1:y * stride + 1 + width] = bytes(width)
+
+    offsets = [dy * stride + dx for dx, dy in Grid.ORTHOGONAL_OFFSETS + (Grid.DIAGONAL_OFFSETS if diagonals else ())]
+    stack: list[int] = []
+    candidates: list[int] = []
+    current = stride + 1
+
+    while True:
+        cells[current] = OPEN
+        candidates.clear()
+        for offset in offsets:
+            neighbor = current + offset
+            if cells[neighbor] != WALL:
+                continue
+
+            opened = 0
+            for around in offsets:
+                if cells[neighbor + around] == OPEN:
+                    opened += 1
+            if opened <= 1:
+                candidates.append(neighbor)
+
+        if candidates:
+            stack.append(current)
+            current = candidates[rng.randrange(len(candidates))]
+        elif stack:
+            current = stack.pop()
+        else:
+            break
+
+    return bytearray().join(cells[y * stride + 1:y * stride + 1 + width] for y in range(1, height + 1))
+
+
+class DepthFirst(MazeGenerator):
+    @override
+    def carve(self, width: int, height: int, diagonals: bool, rng: random.Random) -> bytearray:
+        return carve_depth_first(width, height, diagonals, rng)
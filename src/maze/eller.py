@@ -0,0 +1,59 @@
+import random
+from typing import Iterator, override
+
+from maze.generator import OPEN, MazeGenerator
+
+
+class Eller(MazeGenerator):
+    @override
+    def carve(self, width: int, height: int, diagonals: bool, rng: random.Random) -> bytearray:
+        return bytearray().join(self.rows(width, height, rng))
+
+    # Yields the maze one cell row at a time while only remembering the set of each room in the
+    # current row, so memory stays proportional to the width
+    def rows(self, width: int, height: int, rng: random.Random) -> Iterator[bytearray]:
+        columns = (width + 1) // 2
+        room_rows = (height + 1) // 2
+        sets = list(range(columns))
+
+        for room_row in range(room_rows):
+            last = room_row == room_rows - 1
+            parents = list(range(columns))
+
+            def find(label: int) -> int:
+                while parents[label] != label:
+                    parents[label] = parents[parents[label]]
+                    label = parents[label]
+                return label
+
+            row = bytearray(width)
+            row[0:2 * columns:2] = bytes([OPEN]) * columns
+            for column in range(columns - 1):
+                a, b = find(sets[column]), find(sets[column + 1])
+                if a != b and (last or rng.random() < 0.5):
+                    parents[b] = a
+                    row[2 * column + 1] = OPEN
+            yield row
+
+            if last:
+                break
+
+            members: dict[int, list[int]] = {}
+            for column in range(columns):
+                members.setdefault(find(sets[column]), []).append(column)
+
+            down = bytearray(width)
+            next_sets = [-1] * columns
+            for label, group in members.items():
+                extended = [column for column in group if rng.random() < 0.5] \
+                    or [group[rng.randrange(len(group))]]
+                for column in extended:
+                    down[2 * column] = OPEN
+                    next_sets[column] = label
+
+            fresh = iter([label for label in range(columns) if label not in members])
+            sets = [label if label >= 0 else next(fresh) for label in next_sets]
+            yield down
+
+        if height % 2 == 0:
+            yield bytearray(width)
@@ -0,0 +1,62 @@
+import random
+from abc import ABC, abstractmethod
+from typing import Final
+
+WALL: Final[int] = 0
+OPEN: Final[int] = 1
+
+
+class MazeGenerator(ABC):
+    # Returns one byte per cell in y * width + x order, OPEN or WALL
+    @abstractmethod
+    def carve(self, width: int, height: int, diagonals: bool, rng: random.Random) -> bytearray:
+        raise NotImplementedError()
+
+
+class RoomLattice:
+    # Rooms sit on even coordinates and the cells between two rooms are their passage, which is
+    # the layout the passage-carving algorithms (Kruskal, Prim, Wilson, ...) work on
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.columns = (width + 1) // 2
+        self.rows = (height + 1) // 2
+        self.cells = bytearray(width * height)
+
+    @property
+    def size(self) -> int:
+        return self.columns * self.rows
+
+    def room_cell(self, room: int) -> int:
+        row, column = divmod(room, self.columns)
+        return 2 * row * self.width + 2 * column
+
+    def neighbors(self, room: int) -> list[int]:
+        row, column = divmod(room, self.columns)
+        rooms = []
+        if row > 0:
+            rooms.append(room - self.columns)
+        if row < self.rows - 1:
+            rooms.append(room + self.columns)
+        if column > 0:
+            rooms.append(room - 1)
+        if column < self.columns - 1:
+            rooms.append(room + 1)
+        return rooms
+
+    def edges(self) -> list[tuple[int, int]]:
+        edges = []
+        for room in range(self.size):
+            row, column = divmod(room, self.columns)
+            if column < self.columns - 1:
+                edges.append((room, room + 1))
+            if row < self.rows - 1:
+                edges.append((room, room + self.columns))
+        return edges
+
+    def open_room(self, room: int) -> None:
+        self.cells[self.room_cell(room)] = OPEN
+
+    def open_passage(self, a: int, b: int) -> None:
+        ca, cb = self.room_cell(a), self.room_cell(b)
+        self.cells[ca] = self.cells[cb] = self.cells[(ca + cb) // 2] = OPEN
@@ -0,0 +1,21 @@
+import random
+from typing import override
+
+from maze.generator import MazeGenerator, RoomLattice
+from models import DisjointSet
+
+
+class Kruskal(MazeGenerator):
+    @override
+    def carve(self, width: int, height: int, diagonals: bool, rng: random.Random) -> bytearray:
+        lattice = RoomLattice(width, height)
+        sets = DisjointSet(lattice.size)
+        edges = lattice.edges()
+        rng.shuffle(edges)
+
+        lattice.open_room(0)
+        for a, b in edges:
+            if sets.union(a, b):
+                lattice.open_passage(a, b)
+
+        return lattice.cells
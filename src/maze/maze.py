@@ -0,0 +1,210 @@
+import random
+from typing import Final, Iterable, Optional
+
+import numpy as np
+import pygame
+
+from enums import DiagonalRule, State, Terrain
+from log import timed
+from maze.depth_first import DepthFirst
+from maze.generator import OPEN, MazeGenerator
+from maze.palette import HEAT_RAMP, TERRAIN_PALETTE, heat_to_pixels, mapped_palette, states_to_pixels
+from maze.storage import MappedGrid, MazeHeader, save_grid
+from models import Cell, ConnectedComponents, Dimensions, Grid, ICellStateListener
+
+_OPENED_TO_STATE: Final[bytes] = bytes(State.OPEN.value if code == OPEN else State.WALL.value for code in range(256))
+
+
+class Maze(ICellStateListener):
+    # Past this many changed cells one full-window update is cheaper than updating each rect
+    MAX_DIRTY_RECTS: Final[int] = 512
+    # Random cells tried before sampling falls back to listing the candidates
+    SAMPLE_ATTEMPTS: Final[int] = 64
+
+    def __init__(self, width: int, height: int) -> None:
+        self._width: int = width
+        self._height: int = height
+        self._cell_size: Dimensions = Dimensions(1, 1)
+        self._grid: Grid = Grid(0, 0, False, self)
+        # Kept across regenerated and loaded mazes
+        self._diagonal_rule: DiagonalRule = DiagonalRule.ALWAYS
+        self.components: ConnectedComponents = ConnectedComponents(self._grid)
+        self._surf: Optional[pygame.Surface] = None
+        self._palette: Optional[np.ndarray] = None
+        self._ramp: Optional[np.ndarray] = None
+        self._terrain_palette: Optional[np.ndarray] = None
+        # One value per cell drawn over open cells until the grid is rewritten
+        self._heatmap: Optional[np.ndarray] = None
+        self._dirty: set[int] = set()
+        self._needs_write: bool = False
+        self.seed: Optional[int] = None
+
+    @property
+    def grid(self) -> Grid:
+        return self._grid
+
+    @property
+    def cell_size(self) -> Dimensions:
+        return self._cell_size
+
+    @property
+    def diagonal_rule(self) -> DiagonalRule:
+        return self._diagonal_rule
+
+    def set_diagonal_rule(self, rule: DiagonalRule) -> None:
+        self._diagonal_rule = rule
+        self._grid.set_diagonal_rule(rule)
+
+    @timed('Maze.generate')
+    def generate(self, cell_size: Dimensions, diagonals: bool, seed: Optional[int] = None, \
+                 generator: Optional[MazeGenerator] = None) -> None:
+        seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.fill(cell_size, diagonals, seed, self.carve(cell_size, diagonals, seed, generator))
+
+    # Only reads the window size, so it can run off the main thread while the current maze is drawn
+    def carve(self, cell_size: Dimensions, diagonals: bool, seed: int, \
+              generator: Optional[MazeGenerator] = None) -> bytearray:
+        width, height = int(self._width / cell_size.width), int(self._height / cell_size.height)
+        return (generator or DepthFirst()).carve(width, height, diagonals, random.Random(seed))
+
+    # Replaces the maze with one carved for the same cell size
+    def fill(self, cell_size: Dimensions, diagonals: bool, seed: int, opened: bytearray) -> None:
+        self.seed = seed
+        self._generate_cells(cell_size, diagonals)
+        self._grid.write_states(opened.translate(_OPENED_TO_STATE))
+
+    @timed('Maze.save')
+    def save(self, path: str) -> MazeHeader:
+        return save_grid(path, self._grid, self.seed or 0)
+
+    # Loads a maze file, growing the cells to fill the window when the maze has fewer of them
+    @timed('Maze.load')
+    def load(self, path: str) -> None:
+        with MappedGrid(path) as mapped:
+            cell_size = Dimensions(self._width // mapped.width, self._height // mapped.height)
+            if cell_size.width == 0 or cell_size.height == 0:
+                raise ValueError(f'A {mapped.width}x{mapped.height} maze does not fit in the window')
+
+            self.seed = mapped.header.seed
+            self._generate_cells(cell_size, mapped.diagonals, Dimensions(mapped.width, mapped.height))
+            self._grid.write_states(mapped.unpack_states())
+
+    def draw_surf(self) -> tuple[pygame.Surface, list[pygame.Rect]]:
+        if self._surf is None:
+            self._surf = pygame.Surface((self._width, self._height))
+            self._palette = mapped_palette(self._surf)
+            self._ramp = mapped_palette(self._surf, HEAT_RAMP)
+            self._terrain_palette = mapped_palette(self._surf, TERRAIN_PALETTE)
+            self._needs_write = True
+
+        if self._needs_write:
+            self._paint_all()
+            rects = [self._surf.get_rect()]
+        else:
+            rects = self._paint(self._dirty)
+            if len(rects) > self.MAX_DIRTY_RECTS:
+                rects = [self._surf.get_rect()]
+
+        self._dirty.clear()
+        self._needs_write = False
+
+        return self._surf, rects
+
+    def _paint_all(self) -> None:
+        assert self._surf is not None and self._palette is not None
+        self._surf.fill(State.WALL.color())
+        if self._grid.size == 0:
+            return
+
+        if self._heatmap is not None:
+            assert self._ramp is not None
+            pixels = heat_to_pixels(self._heatmap, self._grid.states, self._grid.width, self._grid.height, \
+                                    self._cell_size.width, self._cell_size.height, self._palette, self._ramp)
+        else:
+            terrain = self._grid.terrain if self._grid.has_terrain() else None
+            pixels = states_to_pixels(self._grid.states, self._grid.width, self._grid.height, \
+                                      self._cell_size.width, self._cell_size.height, self._palette, \
+                                      terrain, self._terrain_palette)
+        area = pygame.Rect(0, 0, pixels.shape[0], pixels.shape[1])
+        pygame.surfarray.blit_array(self._surf.subsurface(area), pixels)
+
+    def show_heatmap(self, values: np.ndarray) -> None:
+        assert len(values) == self._grid.size, 'Heatmap does not match the grid size'
+        self._heatmap = values
+        self._needs_write = True
+
+    def _paint(self, indices: Iterable[int]) -> list[pygame.Rect]:
+        assert self._surf is not None
+        states, terrain = self._grid.states, self._grid.terrain
+        width, height = self._cell_size.width, self._cell_size.height
+        rects: list[pygame.Rect] = []
+        for index in indices:
+            y, x = divmod(index, self._grid.width)
+            rect = pygame.Rect(x * width, y * height, width, height)
+            if states[index] == State.OPEN.value and terrain and terrain[index] != Terrain.PLAIN.value:
+                self._surf.fill(tuple(TERRAIN_PALETTE[terrain[index]]), rect)
+            else:
+                self._surf.fill(State(states[index]).color(), rect)
+            rects.append(rect)
+
+        return rects
+
+    def cell(self, index: int) -> Cell:
+        x, y = self._grid.coords(index)
+        return Cell(x, y, self._cell_size, self._grid)
+
+    def reopen_cells(self, openable_only: bool=True) -> None:
+        self._grid.replace_states([state for state in State if state.is_openable() or not openable_only], State.OPEN)
+
+    # With connected_to, only cells a path from that cell can reach are sampled
+    def get_random_transversible_point(self, connected_to: Optional[Cell] = None) -> Cell:
+        def accept(index: int) -> bool:
+            if not self._grid.is_transversible(index):
+                return False
+            return connected_to is None \
+                or (index != connected_to.index and self.components.connected(index, connected_to.index))
+
+        for _ in range(self.SAMPLE_ATTEMPTS):
+            index = random.randrange(self._grid.size)
+            if accept(index):
+                return self.cell(index)
+
+        candidates = range(self._grid.size) if connected_to is None else self.components.cells(connected_to.index)
+        return self.cell(random.choice([index for index in candidates if accept(index)]))
+
+    def get_random_connected_points(self) -> tuple[Cell, Cell]:
+        start = self.get_random_transversible_point()
+        for _ in range(self.SAMPLE_ATTEMPTS):
+            try:
+                return start, self.get_random_transversible_point(connected_to=start)
+            except IndexError:
+                start = self.get_random_transversible_point()
+
+        return start, self.get_random_transversible_point()
+
+    def get_cell(self, x: int, y: int) -> Cell | None:
+        cx = x // self._cell_size.width
+        cy = y // self._cell_size.height
+        if not self._grid.contains(cx, cy):
+            return None
+
+        return Cell(cx, cy, self._cell_size, self._grid)
+
+    def on_cell_state_change(self, index: int) -> None:
+        if not self._needs_write:
+            self._dirty.add(index)
+
+    def on_grid_change(self) -> None:
+        self._heatmap = None
+        self._dirty.clear()
+        self._needs_write = True
+
+    def _generate_cells(self, cell_size: Dimensions, diagonals: bool, dimensions: Optional[Dimensions] = None) -> None:
+        w = int(self._width / cell_size.width) if dimensions is None else dimensions.width
+        h = int(self._height / cell_size.height) if dimensions is None else dimensions.height
+        self._cell_size = cell_size
+        self.components.close()
+        self._grid = Grid(w, h, diagonals, self, diagonal_rule=self._diagonal_rule)
+        self.components = ConnectedComponents(self._grid)
+        self._heatmap = None
+        self._needs_write = True
\ No newline at end of file
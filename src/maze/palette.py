@@ -0,0 +1,72 @@
+from typing import Final, Optional
+
+import numpy as np
+import pygame
+
+from enums import Color, State, Terrain
+
+STATE_PALETTE: Final[np.ndarray] = np.zeros((256, 3), dtype=np.uint8)
+for _state in State:
+    STATE_PALETTE[_state.value] = _state.color()
+
+# Open cells are tinted by terrain cost, towards grey when cheaper than plain ground and towards
+# brown when costlier
+TERRAIN_PALETTE: Final[np.ndarray] = np.zeros((256, 3), dtype=np.uint8)
+_COSTS: Final[list[float]] = [terrain.cost() for terrain in Terrain]
+for _terrain in Terrain:
+    _cost = _terrain.cost()
+    if _cost < 1.0:
+        _end, _t = Color.CHEAP_TERRAIN.value, (1.0 - _cost) / (1.0 - min(_COSTS))
+    else:
+        _end, _t = Color.COSTLY_TERRAIN.value, (_cost - 1.0) / max(max(_COSTS) - 1.0, 1.0)
+    TERRAIN_PALETTE[_terrain.value] = np.array(Color.OPEN.value) + (np.array(_end) - np.array(Color.OPEN.value)) * _t
+
+# Heatmap colours from near (blue) through green and yellow to far (red)
+_RAMP_STOPS: Final[np.ndarray] = np.array([(0, 0, 255), (0, 255, 255), (0, 255, 0), (255, 255, 0), (255, 0, 0)])
+HEAT_RAMP: Final[np.ndarray] = np.stack([np.interp(np.linspace(0, len(_RAMP_STOPS) - 1, 256), \
+                                                   np.arange(len(_RAMP_STOPS)), _RAMP_STOPS[:, channel]) \
+                                         for channel in range(3)], axis=1).astype(np.uint8)
+# States a heatmap is drawn over; the rest (walls, endpoints, routes) keep their colours
+_HEATED: Final[np.ndarray] = np.zeros(256, dtype=np.bool_)
+_HEATED[[State.OPEN.value, State.SEARCHED.value, State.SEARCHED_REVERSE.value]] = True
+
+
+def mapped_palette(surf: pygame.Surface, colors: np.ndarray = STATE_PALETTE) -> np.ndarray:
+    return np.array([surf.map_rgb(tuple(rgb)) for rgb in colors], dtype=np.uint32)
+
+
+def states_to_pixels(states: bytes | bytearray | memoryview, width: int, height: int, \
+                     cell_width: int, cell_height: int, palette: np.ndarray, \
+                     terrain: Optional[bytearray] = None, terrain_palette: Optional[np.ndarray] = None) -> np.ndarray:
+    codes = np.frombuffer(states, dtype=np.uint8)
+    pixels = palette[codes]
+    if terrain is not None and terrain_palette is not None:
+        terrain_codes = np.frombuffer(terrain, dtype=np.uint8)
+        tinted = (codes == State.OPEN.value) & (terrain_codes != Terrain.PLAIN.value)
+        pixels[tinted] = terrain_palette[terrain_codes[tinted]]
+
+    return _scale(pixels.reshape(height, width), cell_width, cell_height)
+
+
+# Cells with a finite value are coloured along the ramp, scaled to the largest finite value
+def heat_to_pixels(values: np.ndarray, states: bytes | bytearray | memoryview, width: int, height: int, \
+                   cell_width: int, cell_height: int, palette: np.ndarray, ramp: np.ndarray) -> np.ndarray:
+    codes = np.frombuffer(states, dtype=np.uint8)
+    pixels = palette[codes]
+    heated = _HEATED[codes] & np.isfinite(values)
+    if heated.any():
+        heat = values[heated]
+        levels = heat * (255 / max(float(heat.max()), 1.0))
+        pixels[heated] = ramp[levels.astype(np.uint8)]
+
+    return _scale(pixels.reshape(height, width), cell_width, cell_height)
+
+
+def _scale(pixels: np.ndarray, cell_width: int, cell_height: int) -> np.ndarray:
+    if cell_height > 1:
+        pixels = np.repeat(pixels, cell_height, axis=0)
+    if cell_width > 1:
+        pixels = np.repeat(pixels, cell_width, axis=1)
+
+    # surfarray indexes pixels as [x][y]
+    return pixels.T
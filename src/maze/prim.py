@@ -0,0 +1,29 @@
+import random
+from typing import override
+
+from maze.generator import MazeGenerator, RoomLattice
+
+
+class Prim(MazeGenerator):
+    @override
+    def carve(self, width: int, height: int, diagonals: bool, rng: random.Random) -> bytearray:
+        lattice = RoomLattice(width, height)
+        in_maze = bytearray(lattice.size)
+        start = rng.randrange(lattice.size)
+        in_maze[start] = 1
+        lattice.open_room(start)
+        frontier = [(start, room) for room in lattice.neighbors(start)]
+
+        while frontier:
+            # Swap-remove a random frontier edge
+            position = rng.randrange(len(frontier))
+            frontier[position], frontier[-1] = frontier[-1], frontier[position]
+            source, room = frontier.pop()
+            if in_maze[room]:
+                continue
+
+            in_maze[room] = 1
+            lattice.open_passage(source, room)
+            frontier.extend((room, neighbor) for neighbor in lattice.neighbors(room) if not in_maze[neighbor])
+
+        return lattice.cells
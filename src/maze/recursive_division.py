@@ -0,0 +1,42 @@
+import random
+from typing import override
+
+from maze.generator import OPEN, WALL, MazeGenerator, RoomLattice
+
+
+class RecursiveDivision(MazeGenerator):
+    @override
+    def carve(self, width: int, height: int, diagonals: bool, rng: random.Random) -> bytearray:
+        lattice = RoomLattice(width, height)
+        cells = lattice.cells
+        open_width, open_height = 2 * lattice.columns - 1, 2 * lattice.rows - 1
+        for y in range(open_height):
+            cells[y * width:y * width + open_width] = bytes([OPEN]) * open_width
+
+        # Chambers are (first column, first row, columns, rows) in room coordinates
+        chambers = [(0, 0, lattice.columns, lattice.rows)]
+        while chambers:
+            column, row, columns, rows = chambers.pop()
+            if columns < 2 or rows < 2:
+                continue
+
+            if rows > columns or (rows == columns and rng.random() < 0.5):
+                split = rng.randrange(1, rows)
+                gap = column + rng.randrange(columns)
+                y = 2 * (row + split) - 1
+                for x in range(2 * column, 2 * (column + columns) - 1):
+                    cells[y * width + x] = WALL
+                cells[y * width + 2 * gap] = OPEN
+                chambers.append((column, row, columns, split))
+                chambers.append((column, row + split, columns, rows - split))
+            else:
+                split = rng.randrange(1, columns)
+                gap = row + rng.randrange(rows)
+                x = 2 * (column + split) - 1
+                for y in range(2 * row, 2 * (row + rows) - 1):
+                    cells[y * width + x] = WALL
+                cells[2 * gap * width + x] = OPEN
+                chambers.append((column, row, split, rows))
+                chambers.append((column + split, row, columns - split, rows))
+
+        return cells
@@ -0,0 +1,35 @@
+import random
+from typing import override
+
+from maze.generator import OPEN, WALL, MazeGenerator
+from maze.kruskal import Kruskal
+
+
+class Rooms(MazeGenerator):
+    def __init__(self, loop_chance: float = 0.1, cells_per_room: int = 400, max_room_size: int = 12) -> None:
+        self._loop_chance = loop_chance
+        self._cells_per_room = cells_per_room
+        self._max_room_size = max_room_size
+
+    @override
+    def carve(self, width: int, height: int, diagonals: bool, rng: random.Random) -> bytearray:
+        cells = Kruskal().carve(width, height, diagonals, rng)
+
+        # Knock out passage walls (cells between two rooms) to add loops
+        for y in range(height):
+            for x in range((y + 1) % 2, width, 2):
+                index = y * width + x
+                if cells[index] == WALL and rng.random() < self._loop_chance \
+                        and (x + 1 < width if y % 2 == 0 else y + 1 < height):
+                    cells[index] = OPEN
+
+        for _ in range(max(1, width * height // self._cells_per_room)):
+            room_width = rng.randint(3, self._max_room_size)
+            room_height = rng.randint(3, self._max_room_size)
+            left = rng.randrange(max(1, width - room_width))
+            top = rng.randrange(max(1, height - room_height))
+            for y in range(top, min(height, top + room_height)):
+                cells[y * width + left:y * width + min(width, left + room_width)] = \
+                    bytes([OPEN]) * (min(width, left + room_width) - left)
+
+        return cells
@@ -0,0 +1,167 @@
+import mmap
+import random
+import struct
+from dataclasses import dataclass
+from math import sqrt
+from typing import ClassVar, Final, Iterable, Optional, Self
+
+import numpy as np
+
+from enums import State, Terrain
+from maze.eller import Eller
+from models import Grid
+
+# Magic, format version, flags, reserved, width, height, seed. Rows follow the header, one bit
+# per cell (1 = open) packed least significant bit first, each row padded to a whole byte so any
+# row can be addressed without reading the ones before it
+_HEADER: Final[struct.Struct] = struct.Struct('<4sBBHIIQ')
+MAGIC: Final[bytes] = b'PYSM'
+FORMAT_VERSION: Final[int] = 1
+FLAG_DIAGONALS: Final[int] = 1
+
+_BITS_TO_STATE: Final[np.ndarray] = np.array([State.WALL.value, State.OPEN.value], dtype=np.uint8)
+
+
+@dataclass
+class MazeHeader:
+    width: int
+    height: int
+    diagonals: bool
+    seed: int
+
+    SIZE: ClassVar[int] = _HEADER.size
+
+    @property
+    def row_bytes(self) -> int:
+        return (self.width + 7) // 8
+
+    @property
+    def file_size(self) -> int:
+        return self.SIZE + self.row_bytes * self.height
+
+    def pack(self) -> bytes:
+        return _HEADER.pack(MAGIC, FORMAT_VERSION, FLAG_DIAGONALS if self.diagonals else 0, 0, \
+                            self.width, self.height, self.seed)
+
+    @classmethod
+    def unpack(cls, buffer: bytes) -> Self:
+        if len(buffer) < _HEADER.size:
+            raise ValueError('Not a maze file')
+
+        magic, version, flags, _, width, height, seed = _HEADER.unpack_from(buffer)
+        if magic != MAGIC:
+            raise ValueError('Not a maze file')
+        if version != FORMAT_VERSION:
+            raise ValueError(f'Unsupported maze file version {version}')
+        return cls(width, height, bool(flags & FLAG_DIAGONALS), seed)
+
+
+def pack_row(row: bytes | bytearray) -> bytes:
+    return np.packbits(np.frombuffer(row, dtype=np.uint8), bitorder='little').tobytes()
+
+
+def write_rows(path: str, header: MazeHeader, rows: Iterable[bytes | bytearray]) -> None:
+    written = 0
+    with open(path, 'wb') as file:
+        file.write(header.pack())
+        for row in rows:
+            file.write(pack_row(row))
+            written += 1
+
+    assert written == header.height, f'Expected {header.height} rows, got {written}'
+
+
+def save_grid(path: str, grid: Grid, seed: int = 0) -> MazeHeader:
+    header = MazeHeader(grid.width, grid.height, grid.diagonals, seed)
+    opened = grid.passable_mask().reshape(grid.height, grid.width)
+    with open(path, 'wb') as file:
+        file.write(header.pack())
+        file.write(np.packbits(opened, axis=1, bitorder='little').tobytes())
+
+    return header
+
+
+# Generates a maze straight to disk one row at a time, so only the current row and Eller's set
+# labels for it are ever in memory
+def stream_maze(path: str, width: int, height: int, diagonals: bool = False, seed: Optional[int] = None) -> MazeHeader:
+    header = MazeHeader(width, height, diagonals, seed if seed is not None else random.randrange(2 ** 32))
+    write_rows(path, header, Eller().rows(width, height, random.Random(header.seed)))
+    return header
+
+
+# A read-only grid over a memory-mapped maze file. Cells are read straight from the packed bits, so
+# opening a file costs nothing up front. The searches still build the neighbour masks on first use,
+# one private byte per cell (eight times the file's bits), so a map has to fit in memory that way.
+# They are not stored in the file, as they depend on the diagonal rule; BatchRunner builds them once
+# into the block its workers share.
+class MappedGrid(Grid):
+    def __init__(self, path: str) -> None:
+        with open(path, 'rb') as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            self.header = MazeHeader.unpack(self._buffer)
+            if len(self._buffer) < self.header.file_size:
+                raise ValueError('Truncated maze file')
+        except Exception:
+            self._buffer.close()
+            raise
+
+        super().__init__(0, 0, self.header.diagonals)
+        self.width = self.header.width
+        self.height = self.header.height
+        self._row_bytes = self.header.row_bytes
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._buffer.close()
+
+    # A view of the mapping rather than a copy; close fails while one is still referenced
+    def rows(self) -> np.ndarray:
+        return np.frombuffer(self._buffer, dtype=np.uint8, count=self._row_bytes * self.height, \
+                             offset=MazeHeader.SIZE).reshape(self.height, self._row_bytes)
+
+    # One State code per cell, in the layout of Grid.states
+    def unpack_states(self) -> bytearray:
+        return bytearray(_BITS_TO_STATE[self._unpack_bits()].tobytes())
+
+    def passable_mask(self) -> np.ndarray:
+        return self._unpack_bits().astype(np.bool_).ravel()
+
+    def _unpack_bits(self) -> np.ndarray:
+        return np.unpackbits(self.rows(), axis=1, count=self.width, bitorder='little')
+
+    def is_passable(self, index: int) -> bool:
+        y, x = divmod(index, self.width)
+        return (self._buffer[MazeHeader.SIZE + y * self._row_bytes + (x >> 3)] >> (x & 7)) & 1 == 1
+
+    def is_transversible(self, index: int) -> bool:
+        return self.is_passable(index)
+
+    def state(self, index: int) -> State:
+        return State.OPEN if self.is_passable(index) else State.WALL
+
+    def set_state(self, index: int, state: State) -> None:
+        raise TypeError('Mapped grids are read-only')
+
+    def write_states(self, states: bytes | bytearray) -> None:
+        raise TypeError('Mapped grids are read-only')
+
+    # Maze files carry no terrain, so every cell is plain and its terrain layer is left empty
+    def terrain_at(self, index: int) -> Terrain:
+        return Terrain.PLAIN
+
+    def step_cost(self, a: int, b: int) -> float:
+        (ax, ay), (bx, by) = self.coords(a), self.coords(b)
+        return sqrt((ax - bx) ** 2 + (ay - by) ** 2)
+
+    def set_terrain(self, index: int, terrain: Terrain) -> None:
+        raise TypeError('Mapped grids are read-only')
+
+    def write_terrain(self, terrain: bytes | bytearray) -> None:
+        raise TypeError('Mapped grids are read-only')
@@ -0,0 +1,34 @@
+import random
+from typing import Final
+
+import numpy as np
+
+from enums import Terrain
+
+# Share of patches left plain; the rest are spread evenly over the costlier terrain
+PLAIN_SHARE: Final[float] = 0.5
+
+
+# Rectangular patches of terrain, smoothed like the caves so their edges look natural, crossed by
+# a few straight roads. Returns one Terrain code per cell.
+def scatter_terrain(width: int, height: int, rng: random.Random, patch: int = 8, roads: int = 4) -> bytearray:
+    noise = np.random.default_rng(rng.getrandbits(64))
+    costly = np.array([terrain.value for terrain in Terrain if terrain.cost() > 1.0], dtype=np.uint8)
+    rows, columns = -(-height // patch), -(-width // patch)
+    codes = np.where(noise.random((rows, columns)) < PLAIN_SHARE, Terrain.PLAIN.value,
+                     noise.choice(costly, size=(rows, columns))).astype(np.uint8)
+    terrain = np.repeat(np.repeat(codes, patch, axis=0), patch, axis=1)[:height, :width]
+
+    # Each cell takes the terrain of a random cell nearby, which breaks up the patch edges
+    jitter = patch // 2
+    ys = np.clip(np.arange(height)[:, None] + noise.integers(-jitter, jitter + 1, (height, width)), 0, height - 1)
+    xs = np.clip(np.arange(width)[None, :] + noise.integers(-jitter, jitter + 1, (height, width)), 0, width - 1)
+    terrain = terrain[ys, xs]
+
+    for _ in range(roads):
+        if rng.random() < 0.5:
+            terrain[rng.randrange(height), :] = Terrain.ROAD.value
+        else:
+            terrain[:, rng.randrange(width)] = Terrain.ROAD.value
+
+    return bytearray(terrain.tobytes())
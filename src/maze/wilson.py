@@ -0,0 +1,33 @@
+import random
+from array import array
+from typing import override
+
+from maze.generator import MazeGenerator, RoomLattice
+
+
+class Wilson(MazeGenerator):
+    @override
+    def carve(self, width: int, height: int, diagonals: bool, rng: random.Random) -> bytearray:
+        lattice = RoomLattice(width, height)
+        in_tree = bytearray(lattice.size)
+        # Last exit taken from each room during the current walk; overwriting it erases loops
+        exits = array('l', [-1]) * lattice.size
+
+        root = rng.randrange(lattice.size)
+        in_tree[root] = 1
+        lattice.open_room(root)
+
+        for origin in range(lattice.size):
+            room = origin
+            while not in_tree[room]:
+                neighbors = lattice.neighbors(room)
+                exits[room] = neighbors[rng.randrange(len(neighbors))]
+                room = exits[room]
+
+            room = origin
+            while not in_tree[room]:
+                in_tree[room] = 1
+                lattice.open_passage(room, exits[room])
+                room = exits[room]
+
+        return lattice.cells
@@ -1,6 +1,8 @@
 from models.cell import *
+from models.components import *
 from models.dimensions import *
-from models.node import *
+from models.disjoint_set import *
+from models.grid import *
 from models.point import *
 from models.start_end import *
 from models.value_range import *
\ No newline at end of file
@@ -0,0 +1,174 @@
+from array import array
+from collections import deque
+from typing import Final
+
+import numpy as np
+
+from models.disjoint_set import DisjointSet
+from models.grid import Grid, IPassabilityListener
+
+_NO_LABEL: Final[int] = -1
+
+
+# Connected regions of passable cells. Every passable cell carries a label and labels that turn out
+# to be connected are merged in a disjoint set, so opening a cell only unions its neighbours'
+# labels. Closing a cell may split its region: searches from each of its neighbours run in lockstep
+# until they meet, and any that runs dry first is a region of its own and gets a fresh label.
+class ConnectedComponents(IPassabilityListener):
+    def __init__(self, grid: Grid) -> None:
+        self.grid = grid
+        self._labels = array('q')
+        self._sets = DisjointSet(0)
+        self._stale = True
+        grid.add_passability_listener(self)
+
+    def close(self) -> None:
+        self.grid.remove_passability_listener(self)
+
+    def on_passability_change(self, index: int) -> None:
+        if self._stale:
+            return
+
+        if self.grid.is_passable(index):
+            self._join(index)
+        else:
+            self._split(index)
+
+    def on_passability_reset(self) -> None:
+        self._stale = True
+
+    # Terrain only changes what a step costs, never which cells connect
+    def on_cost_change(self, index: int) -> None:
+        pass
+
+    def on_cost_reset(self) -> None:
+        pass
+
+    def label(self, index: int) -> int:
+        if self._stale:
+            self._label_all()
+
+        label = self._labels[index]
+        return _NO_LABEL if label == _NO_LABEL else self._sets.find(label)
+
+    def connected(self, a: int, b: int) -> bool:
+        label = self.label(a)
+        return label != _NO_LABEL and label == self.label(b)
+
+    def count(self) -> int:
+        if self._stale:
+            self._label_all()
+
+        find = self._sets.find
+        return len({find(label) for label in set(self._labels) if label != _NO_LABEL})
+
+    # Every cell of the region containing index, found by flood fill
+    def cells(self, index: int) -> list[int]:
+        if not self.grid.is_passable(index):
+            return []
+
+        seen = {index}
+        frontier = [index]
+        while frontier:
+            for neighbor in self.grid.passable_neighbors(frontier.pop()):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    frontier.append(neighbor)
+        return list(seen)
+
+    # Labels horizontal runs of passable cells with numpy, then unions the runs that touch the next row
+    def _label_all(self) -> None:
+        width, height = self.grid.width, self.grid.height
+        passable = self.grid.passable_mask().reshape(height, width)
+
+        starts = passable.copy()
+        starts[:, 1:] &= ~passable[:, :-1]
+        runs = np.where(passable, np.cumsum(starts, dtype=np.int64).reshape(height, width) - 1, _NO_LABEL)
+
+        self._sets = DisjointSet(int(starts.sum()))
+        masks = np.frombuffer(self.grid.neighbor_masks(), dtype=np.uint8).reshape(height, width)[:-1]
+        shifts = (-1, 0, 1) if self.grid.diagonals else (0,)
+        for shift in shifts:
+            upper, lower = runs[:-1], runs[1:]
+            # Whether the step down to the cell below (and shifted) is allowed, under the diagonal rule
+            allowed = (masks >> Grid.DIRECTIONS.index((shift, 1)) & 1).astype(np.bool_)
+            if shift < 0:
+                upper, lower, allowed = upper[:, 1:], lower[:, :-1], allowed[:, 1:]
+            elif shift > 0:
+                upper, lower, allowed = upper[:, :-1], lower[:, 1:], allowed[:, :-1]
+
+            touching = (upper != _NO_LABEL) & (lower != _NO_LABEL) & allowed
+            pairs = np.unique(np.stack((upper[touching], lower[touching]), axis=1), axis=0)
+            for a, b in pairs.tolist():
+                self._sets.union(a, b)
+
+        self._labels = array('q', runs.tobytes())
+        self._stale = False
+
+    def _join(self, index: int) -> None:
+        label = _NO_LABEL
+        for neighbor in self.grid.passable_neighbors(index):
+            other = self._labels[neighbor]
+            if other == _NO_LABEL:
+                continue
+
+            if label == _NO_LABEL:
+                label = other
+            else:
+                self._sets.union(label, other)
+
+        self._labels[index] = label if label != _NO_LABEL else self._sets.add()
+
+    def _split(self, index: int) -> None:
+        if self._labels[index] == _NO_LABEL:
+            return
+
+        self._labels[index] = _NO_LABEL
+        # The cell's own mask still lists what it was linked to, including both ends of any diagonal
+        # step it was a side of
+        starts = self.grid.passable_neighbors(index)
+        if len(starts) < 2:
+            return
+
+        # Each search owns the cells it has reached; searches that meet are merged into the larger one
+        owners: dict[int, int] = {start: search for search, start in enumerate(starts)}
+        merged = list(range(len(starts)))
+        searches = {search: (deque([start]), [start]) for search, start in enumerate(starts)}
+
+        def owner(cell: int) -> int:
+            search = owners[cell]
+            while merged[search] != search:
+                search = merged[search]
+            return search
+
+        while len(searches) > 1:
+            for search in list(searches):
+                if search not in searches:
+                    continue
+
+                frontier, reached = searches[search]
+                if not frontier:
+                    del searches[search]
+                    label = self._sets.add()
+                    for cell in reached:
+                        self._labels[cell] = label
+                    continue
+
+                for neighbor in self.grid.passable_neighbors(frontier.popleft()):
+                    if neighbor not in owners:
+                        owners[neighbor] = search
+                        frontier.append(neighbor)
+                        reached.append(neighbor)
+                        continue
+
+                    other = owner(neighbor)
+                    if other == search:
+                        continue
+
+                    keep, drop = (search, other) if len(reached) >= len(searches[other][1]) else (other, search)
+                    searches[keep][0].extend(searches[drop][0])
+                    searches[keep][1].extend(searches[drop][1])
+                    merged[drop] = keep
+                    del searches[drop]
+                    search = keep
+                    frontier, reached = searches[search]
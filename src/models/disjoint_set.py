@@ -0,0 +1,30 @@
+from array import array
+
+
+class DisjointSet:
+    def __init__(self, size: int) -> None:
+        self.parents = array('l', range(size))
+        self.sizes = array('l', [1]) * size
+
+    def add(self) -> int:
+        self.parents.append(len(self.parents))
+        self.sizes.append(1)
+        return len(self.parents) - 1
+
+    def find(self, item: int) -> int:
+        parents = self.parents
+        while parents[item] != item:
+            parents[item] = parents[parents[item]]
+            item = parents[item]
+        return item
+
+    def union(self, a: int, b: int) -> bool:
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return False
+
+        if self.sizes[a] < self.sizes[b]:
+            a, b = b, a
+        self.parents[b] = a
+        self.sizes[a] += self.sizes[b]
+        return True
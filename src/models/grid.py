@@ -0,0 +1,272 @@
+from math import sqrt
+from typing import Final, Iterable, Optional, Protocol
+
+import numpy as np
+
+from enums import DiagonalRule, State, Terrain
+
+_PASSABLE_CODES: Final[frozenset[int]] = frozenset(state.value for state in State if state.is_passable())
+_PASSABLE: Final[bytes] = bytes(code in _PASSABLE_CODES for code in range(256))
+_PASSABLE_MASK: Final[np.ndarray] = np.frombuffer(_PASSABLE, dtype=np.bool_)
+# Cost multiplier per terrain code, for indexing with the raw bytes of a terrain layer
+_TERRAIN_CODES: Final[frozenset[int]] = frozenset(terrain.value for terrain in Terrain)
+TERRAIN_COSTS: Final[tuple[float, ...]] = tuple(Terrain(code).cost() if code in _TERRAIN_CODES else 1.0 \
+                                                for code in range(256))
+# Neighbour mask bits of the four orthogonal steps; the diagonal steps take the high four
+ORTHOGONAL_BITS: Final[int] = 0x0F
+ALL_BITS: Final[int] = 0xFF
+# Number of steps a mask allows, for every mask value
+# Neighbour masks are built this many cells' worth of rows at a time, so the temporaries stay small
+# next to the masks themselves
+_MASK_BAND_CELLS: Final[int] = 1 << 20
+MASK_DEGREES: Final[np.ndarray] = np.array([mask.bit_count() for mask in range(256)], dtype=np.uint8)
+
+
+class ICellStateListener(Protocol):
+    def on_cell_state_change(self, index: int) -> None:
+        pass
+
+    def on_grid_change(self) -> None:
+        pass
+
+
+class IPassabilityListener(Protocol):
+    def on_passability_change(self, index: int) -> None:
+        pass
+
+    # Sent instead of per-cell changes when a whole buffer of states is written
+    def on_passability_reset(self) -> None:
+        pass
+
+    # The terrain, and so the cost of moving through the cell, changed
+    def on_cost_change(self, index: int) -> None:
+        pass
+
+    # Sent instead of per-cell cost changes when a whole buffer of terrain is written
+    def on_cost_reset(self) -> None:
+        pass
+
+
+class Grid:
+    ORTHOGONAL_OFFSETS: Final[tuple[tuple[int, int], ...]] = ((0, -1), (0, 1), (-1, 0), (1, 0))
+    DIAGONAL_OFFSETS: Final[tuple[tuple[int, int], ...]] = ((1, -1), (1, 1), (-1, -1), (-1, 1))
+    # Bit i of a cell's neighbour mask is set when the step along DIRECTIONS[i] is allowed
+    DIRECTIONS: Final[tuple[tuple[int, int], ...]] = ORTHOGONAL_OFFSETS + DIAGONAL_OFFSETS
+    # Indices into DIRECTIONS of the two orthogonal steps beside each diagonal one, (dx, 0) and (0, dy)
+    DIAGONAL_SIDES: Final[tuple[tuple[int, int], ...]] = ((3, 0), (3, 1), (2, 0), (2, 1))
+
+    # A states buffer (e.g. a shared memory block) is used in place rather than copied, and so is a
+    # masks buffer, which has to have been built from those states under the same diagonal rule
+    def __init__(self, width: int, height: int, diagonals: bool, \
+                 listener: Optional[ICellStateListener] = None, fill: State = State.WALL, \
+                 states: Optional[bytearray | memoryview] = None, \
+                 diagonal_rule: DiagonalRule = DiagonalRule.ALWAYS, \
+                 masks: Optional[bytearray | memoryview] = None) -> None:
+        assert states is None or len(states) == width * height, 'State buffer does not match the grid size'
+        assert masks is None or len(masks) == width * height, 'Mask buffer does not match the grid size'
+        self.width: int = width
+        self.height: int = height
+        self.diagonals: bool = diagonals
+        self.diagonal_rule: DiagonalRule = diagonal_rule
+        self.states: bytearray | memoryview = states if states is not None else bytearray([fill.value]) * (width * height)
+        # One Terrain code per cell; all plain unless painted
+        self.terrain: bytearray = bytearray(width * height)
+        self.offsets: tuple[tuple[int, int], ...] = self.ORTHOGONAL_OFFSETS \
+            + (self.DIAGONAL_OFFSETS if diagonals else ())
+        self._listener = listener
+        self._passability_listeners: list[IPassabilityListener] = []
+        self._prev_states: dict[int, State] = {}
+        # One neighbour mask per cell, built on first use and kept up to date by set_state
+        self._masks: Optional[bytearray | memoryview] = masks
+
+    @property
+    def size(self) -> int:
+        return self.width * self.height
+
+    def index(self, x: int, y: int) -> int:
+        return y * self.width + x
+
+    def coords(self, index: int) -> tuple[int, int]:
+        y, x = divmod(index, self.width)
+        return x, y
+
+    def contains(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def state(self, index: int) -> State:
+        return State(self.states[index])
+
+    def set_state(self, index: int, state: State) -> None:
+        previous = self.states[index]
+        if previous == state.value:
+            return
+
+        self.states[index] = state.value
+        if self._listener:
+            self._listener.on_cell_state_change(index)
+
+        if _PASSABLE[previous] != _PASSABLE[state.value]:
+            if self._masks is not None:
+                self._update_masks(index)
+            for listener in self._passability_listeners:
+                listener.on_passability_change(index)
+
+    def write_states(self, states: bytes | bytearray) -> None:
+        assert len(states) == self.size, 'State buffer does not match the grid size'
+
+        flipped = (bool(self._passability_listeners) or self._masks is not None) \
+            and bytes(self.states).translate(_PASSABLE) != bytes(states).translate(_PASSABLE)
+
+        self.states[:] = states
+        if self._listener:
+            self._listener.on_grid_change()
+
+        if flipped:
+            self._masks = None
+            for listener in self._passability_listeners:
+                listener.on_passability_reset()
+
+    def replace_states(self, old: Iterable[State], new: State) -> None:
+        table = bytearray(range(256))
+        for state in old:
+            table[state.value] = new.value
+
+        self.write_states(bytes(self.states).translate(table))
+
+    def terrain_at(self, index: int) -> Terrain:
+        return Terrain(self.terrain[index])
+
+    def set_terrain(self, index: int, terrain: Terrain) -> None:
+        if self.terrain[index] == terrain.value:
+            return
+
+        self.terrain[index] = terrain.value
+        if self._listener:
+            self._listener.on_cell_state_change(index)
+
+        for listener in self._passability_listeners:
+            listener.on_cost_change(index)
+
+    # Listeners get one cost reset rather than a cost change per cell
+    def write_terrain(self, terrain: bytes | bytearray) -> None:
+        assert len(terrain) == self.size, 'Terrain buffer does not match the grid size'
+        self.terrain[:] = terrain
+        if self._listener:
+            self._listener.on_grid_change()
+
+        for listener in self._passability_listeners:
+            listener.on_cost_reset()
+
+    def has_terrain(self) -> bool:
+        return self.terrain.count(Terrain.PLAIN.value) != len(self.terrain)
+
+    # Heuristics scaled by this stay admissible, as no step costs less than its length times it
+    def min_cost(self) -> float:
+        if not self.has_terrain():
+            return 1.0
+
+        present = np.flatnonzero(np.bincount(np.frombuffer(self.terrain, dtype=np.uint8), minlength=256))
+        return min(TERRAIN_COSTS[code] for code in present.tolist())
+
+    def step_cost(self, a: int, b: int) -> float:
+        (ax, ay), (bx, by) = self.coords(a), self.coords(b)
+        length = sqrt((ax - bx) ** 2 + (ay - by) ** 2)
+        return length * (TERRAIN_COSTS[self.terrain[a]] + TERRAIN_COSTS[self.terrain[b]]) / 2
+
+    def path_cost(self, path: list[int]) -> float:
+        return sum(self.step_cost(a, b) for a, b in zip(path, path[1:]))
+
+    def add_passability_listener(self, listener: IPassabilityListener) -> None:
+        self._passability_listeners.append(listener)
+
+    def remove_passability_listener(self, listener: IPassabilityListener) -> None:
+        self._passability_listeners.remove(listener)
+
+    def is_transversible(self, index: int) -> bool:
+        return self.state(index).is_transversible()
+
+    def is_passable(self, index: int) -> bool:
+        return _PASSABLE[self.states[index]] == 1
+
+    # Flat boolean array, one entry per cell
+    def passable_mask(self) -> np.ndarray:
+        return _PASSABLE_MASK[np.frombuffer(self.states, dtype=np.uint8)]
+
+    def neighbors(self, index: int) -> list[int]:
+        x, y = self.coords(index)
+        return [(y + dy) * self.width + x + dx for dx, dy in self.offsets \
+                if 0 <= x + dx < self.width and 0 <= y + dy < self.height]
+
+    # Cells one allowed step away, with the grid's diagonals and diagonal rule
+    def passable_neighbors(self, index: int) -> list[int]:
+        mask = self.neighbor_masks()[index] & (ALL_BITS if self.diagonals else ORTHOGONAL_BITS)
+        return [index + dy * self.width + dx for direction, (dx, dy) in enumerate(self.DIRECTIONS) \
+                if mask >> direction & 1]
+
+    # Per cell, which of the eight steps out of it land on a passable cell inside the grid without
+    # breaking the diagonal rule. Only the orthogonal bits apply to searches without diagonals.
+    def neighbor_masks(self) -> bytearray | memoryview:
+        if self._masks is None:
+            self._masks = self._build_masks()
+        return self._masks
+
+    def set_diagonal_rule(self, rule: DiagonalRule) -> None:
+        if rule == self.diagonal_rule:
+            return
+
+        self.diagonal_rule = rule
+        self._masks = None
+        for listener in self._passability_listeners:
+            listener.on_passability_reset()
+
+    def _build_masks(self) -> bytearray:
+        width, height = self.width, self.height
+        passable = self.passable_mask().reshape(height, width)
+        masks = bytearray(width * height)
+        rows = np.frombuffer(masks, dtype=np.uint8).reshape(height, width)
+        band = max(1, _MASK_BAND_CELLS // max(width, 1))
+        for top in range(0, height, band):
+            bottom = min(top + band, height)
+            # The band and the rows either side of it, padded with walls past the grid's edges
+            padded = np.pad(passable[max(top - 1, 0):bottom + 1], ((int(top == 0), int(bottom == height)), (1, 1)))
+            free = [padded[1 + dy:1 + dy + bottom - top, 1 + dx:1 + dx + width] for dx, dy in self.DIRECTIONS]
+            for direction, allowed in enumerate(free):
+                if direction >= len(self.ORTHOGONAL_OFFSETS):
+                    first, second = self.DIAGONAL_SIDES[direction - len(self.ORTHOGONAL_OFFSETS)]
+                    allowed = allowed & self.diagonal_rule.allows(free[first], free[second])
+                rows[top:bottom] |= allowed.astype(np.uint8) << direction
+        return masks
+
+    def _cell_mask(self, index: int) -> int:
+        y, x = divmod(index, self.width)
+        free = [self.contains(x + dx, y + dy) and self.is_passable(index + dy * self.width + dx) \
+                for dx, dy in self.DIRECTIONS]
+        mask = 0
+        for direction, allowed in enumerate(free):
+            if direction >= len(self.ORTHOGONAL_OFFSETS):
+                first, second = self.DIAGONAL_SIDES[direction - len(self.ORTHOGONAL_OFFSETS)]
+                allowed = allowed and self.diagonal_rule.allows(free[first], free[second])
+            mask |= allowed << direction
+        return mask
+
+    # A cell's passability only shows in the masks of the cells around it: as the target of their
+    # step, or as a side of their diagonal one
+    def _update_masks(self, index: int) -> None:
+        assert self._masks is not None
+        x, y = self.coords(index)
+        for dx, dy in self.DIRECTIONS:
+            if self.contains(x + dx, y + dy):
+                neighbor = index + dy * self.width + dx
+                self._masks[neighbor] = self._cell_mask(neighbor)
+
+    def highlight(self, index: int) -> None:
+        self._prev_states[index] = self.state(index)
+        self.set_state(index, State.HIGHLIGHTED)
+
+    def unhighlight(self, index: int) -> None:
+        if self.states[index] != State.HIGHLIGHTED.value:
+            return
+
+        assert index in self._prev_states, 'No previous state recorded'
+
+        self.set_state(index, self._prev_states.pop(index))
@@ -0,0 +1,109 @@
+import random
+import unittest
+
+import maze
+from a_star import SearchResult, search
+from a_star.cache import PathCache
+from enums import State, Terrain
+from models import Dimensions
+
+MODE, HEURISTIC = 'a*', 'manhattan'
+
+
+# Sub-path answers are only sound on grids without cycles, where they must match a fresh search
+# cell for cell, terrain costs included, whichever mode is asked for. Every kind of edit to the grid
+# must drop what was cached before it.
+class PathCacheTest(unittest.TestCase):
+    GENERATORS = ('depth-first', 'kruskal', 'wilson')
+    SEEDS = range(4)
+    QUERIES = 20
+
+    def _maze(self, name: str, seed: int, terrain: bool) -> maze.Maze:
+        random.seed(seed)
+        m = maze.Maze(31, 25)
+        m.generate(Dimensions(1, 1), False, seed, maze.get_generator(name))
+        if terrain:
+            m.grid.write_terrain(maze.scatter_terrain(m.grid.width, m.grid.height, random.Random(seed)))
+        return m
+
+    def test_subpath_hits_match_fresh_search(self) -> None:
+        for name in self.GENERATORS:
+            for terrain in (False, True):
+                for seed in self.SEEDS:
+                    with self.subTest(generator=name, terrain=terrain, seed=seed):
+                        self._check_subpaths(self._maze(name, seed, terrain), random.Random(seed))
+
+    def _check_subpaths(self, m: maze.Maze, rng: random.Random) -> None:
+        grid = m.grid
+        cache = PathCache(grid, m.components)
+        try:
+            start, goal = (cell.index for cell in m.get_random_connected_points())
+            result = search(grid, start, goal)
+            cache.put(start, goal, MODE, HEURISTIC, False, result)
+            for _ in range(self.QUERIES):
+                a, b = rng.choice(result.path), rng.choice(result.path)
+                hit = cache.get(a, b, rng.choice(('a*', 'bidirectional', 'jps', 'hpa*')), HEURISTIC, False)
+                expected = search(grid, a, b)
+                self.assertIsNotNone(hit)
+                self.assertEqual(hit.path, expected.path)
+                self.assertAlmostEqual(hit.cost, expected.cost, places=9)
+            self.assertEqual(cache.subpath_hits, self.QUERIES)
+        finally:
+            cache.close()
+
+    def test_no_subpath_hits_with_cycles(self) -> None:
+        m = self._maze('caves', 0, False)
+        cache = PathCache(m.grid, m.components)
+        try:
+            start, goal = (cell.index for cell in m.get_random_connected_points())
+            result = search(m.grid, start, goal)
+            cache.put(start, goal, MODE, HEURISTIC, False, result)
+            self.assertIsNone(cache.get(result.path[1], result.path[-2], MODE, HEURISTIC, False))
+        finally:
+            cache.close()
+
+    def test_walks_with_detours_give_no_subpath_hits(self) -> None:
+        m = self._maze('depth-first', 0, False)
+        cache = PathCache(m.grid, m.components)
+        try:
+            start, goal = (cell.index for cell in m.get_random_connected_points())
+            path = search(m.grid, start, goal).path
+            walk = path[:3] + path[1:]
+            cache.put(start, goal, 'hpa*', HEURISTIC, False, SearchResult(walk, m.grid.path_cost(walk)))
+            self.assertIsNone(cache.get(path[0], path[3], MODE, HEURISTIC, False))
+        finally:
+            cache.close()
+
+    def test_edits_drop_entries(self) -> None:
+        def set_state(m: maze.Maze, cell: int) -> None:
+            m.grid.set_state(cell, State.WALL)
+
+        def write_states(m: maze.Maze, cell: int) -> None:
+            states = bytearray(m.grid.states)
+            states[cell] = State.WALL.value
+            m.grid.write_states(states)
+
+        def write_terrain(m: maze.Maze, cell: int) -> None:
+            terrain = bytearray(m.grid.terrain)
+            terrain[cell] = Terrain.MUD.value
+            m.grid.write_terrain(terrain)
+
+        for edit in (set_state, write_states, write_terrain):
+            with self.subTest(edit=edit.__name__):
+                m = self._maze('caves', 1, False)
+                cache = PathCache(m.grid, m.components)
+                try:
+                    start, goal = (cell.index for cell in m.get_random_connected_points())
+                    cache.put(start, goal, MODE, HEURISTIC, False, search(m.grid, start, goal))
+                    self.assertIsNotNone(cache.get(start, goal, MODE, HEURISTIC, False))
+
+                    edit(m, next(index for index in range(m.grid.size) \
+                                 if m.grid.is_passable(index) and index not in (start, goal)))
+                    self.assertIsNone(cache.get(start, goal, MODE, HEURISTIC, False))
+                    self.assertEqual(cache.version, 1)
+                finally:
+                    cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
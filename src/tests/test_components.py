@@ -0,0 +1,83 @@
+import random
+import unittest
+from collections import deque
+
+from enums import DiagonalRule, State
+from models import ConnectedComponents, Grid
+
+
+# The labels are patched edit by edit: opening a cell merges its neighbours' regions and closing one
+# may split its region. After every edit they are compared with a flood fill over the whole grid
+# that works from coordinates and the diagonal rule, not from the grid's neighbour masks.
+class ConnectedComponentsTest(unittest.TestCase):
+    RULES = (None, *DiagonalRule)
+    SEEDS = range(10)
+    EDITS = 60
+    # Every so often the whole grid is rewritten at once rather than one cell at a time
+    REWRITE_EVERY = 15
+
+    def test_connected_matches_flood_fill(self) -> None:
+        for rule in self.RULES:
+            for seed in self.SEEDS:
+                with self.subTest(rule=rule, seed=seed):
+                    self._check(rule, seed)
+
+    def _check(self, rule: DiagonalRule | None, seed: int) -> None:
+        rng = random.Random(seed)
+        width, height = rng.randrange(4, 16), rng.randrange(4, 16)
+        grid = Grid(width, height, rule is not None, diagonal_rule=rule or DiagonalRule.ALWAYS)
+        grid.write_states(self._random_states(grid, rng))
+        components = ConnectedComponents(grid)
+        try:
+            self._compare(grid, components, rng)
+            for edit in range(1, self.EDITS + 1):
+                if edit % self.REWRITE_EVERY == 0:
+                    grid.write_states(self._random_states(grid, rng))
+                else:
+                    index = rng.randrange(grid.size)
+                    grid.set_state(index, State.WALL if grid.is_passable(index) else State.OPEN)
+                self._compare(grid, components, rng)
+        finally:
+            components.close()
+
+    def _compare(self, grid: Grid, components: ConnectedComponents, rng: random.Random) -> None:
+        regions = self._flood_fill(grid)
+        self.assertEqual(components.count(), len(set(regions.values())))
+        for _ in range(40):
+            a, b = rng.randrange(grid.size), rng.randrange(grid.size)
+            expected = a in regions and regions.get(b) == regions[a]
+            self.assertEqual(components.connected(a, b), expected, (grid.coords(a), grid.coords(b)))
+
+    @staticmethod
+    def _random_states(grid: Grid, rng: random.Random) -> bytearray:
+        density = rng.uniform(0.3, 0.6)
+        return bytearray((State.WALL if rng.random() < density else State.OPEN).value for _ in range(grid.size))
+
+    @staticmethod
+    def _flood_fill(grid: Grid) -> dict[int, int]:
+        def free(x: int, y: int) -> bool:
+            return grid.contains(x, y) and grid.is_passable(grid.index(x, y))
+
+        regions: dict[int, int] = {}
+        for seed in range(grid.size):
+            if seed in regions or not grid.is_passable(seed):
+                continue
+
+            regions[seed] = seed
+            queue = deque([seed])
+            while queue:
+                x, y = grid.coords(queue.popleft())
+                for dx, dy in grid.offsets:
+                    if not free(x + dx, y + dy):
+                        continue
+                    if dx and dy and not grid.diagonal_rule.allows(free(x + dx, y), free(x, y + dy)):
+                        continue
+                    neighbor = grid.index(x + dx, y + dy)
+                    if neighbor not in regions:
+                        regions[neighbor] = seed
+                        queue.append(neighbor)
+        return regions
+
+
+if __name__ == '__main__':
+    unittest.main()
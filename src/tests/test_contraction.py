@@ -0,0 +1,63 @@
+import random
+import unittest
+
+import maze
+from a_star import search
+from a_star.contraction import ContractedPlanner
+from enums import State
+from models import Dimensions, Grid
+
+
+# Contraction is exact, so every answer must cost what a full search costs. Perfect mazes are
+# stripped down to nothing while caves and rooms keep a core to search; wall edits open and close
+# cycles, which moves cells in and out of that core.
+class ContractedPlannerTest(unittest.TestCase):
+    GENERATORS = ('depth-first', 'caves', 'rooms')
+    SEEDS = range(4)
+    QUERIES = 8
+    EDITS = 20
+
+    def test_costs_match_full_search(self) -> None:
+        for name in self.GENERATORS:
+            for diagonals in (False, True):
+                for terrain in (False, True):
+                    for seed in self.SEEDS:
+                        with self.subTest(generator=name, diagonals=diagonals, terrain=terrain, seed=seed):
+                            self._check(name, diagonals, terrain, seed)
+
+    def _check(self, name: str, diagonals: bool, terrain: bool, seed: int) -> None:
+        rng = random.Random(seed)
+        random.seed(seed)
+        m = maze.Maze(rng.randrange(20, 60), rng.randrange(20, 60))
+        m.generate(Dimensions(1, 1), diagonals, seed, maze.get_generator(name))
+        if terrain:
+            m.grid.write_terrain(maze.scatter_terrain(m.grid.width, m.grid.height, rng))
+        planner = ContractedPlanner(m.grid)
+        try:
+            self._query(m.grid, planner, rng)
+            for _ in range(self.EDITS):
+                index = rng.randrange(m.grid.size)
+                m.grid.set_state(index, State.WALL if m.grid.is_passable(index) else State.OPEN)
+            self._query(m.grid, planner, rng)
+        finally:
+            planner.close()
+
+    def _query(self, grid: Grid, planner: ContractedPlanner, rng: random.Random) -> None:
+        opened = [index for index in range(grid.size) if grid.is_passable(index)]
+        for _ in range(self.QUERIES):
+            start, goal = rng.choice(opened), rng.choice(opened)
+            result = planner.search(start, goal)
+            expected = search(grid, start, goal)
+            self.assertEqual(result.found, expected.found)
+            if not expected.found:
+                continue
+
+            self.assertEqual((result.path[0], result.path[-1]), (start, goal))
+            for a, b in zip(result.path, result.path[1:]):
+                self.assertIn(b, grid.passable_neighbors(a))
+            self.assertAlmostEqual(result.cost, grid.path_cost(result.path), places=9)
+            self.assertAlmostEqual(result.cost, expected.cost, places=9)
+
+
+if __name__ == '__main__':
+    unittest.main()
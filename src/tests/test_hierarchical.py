@@ -0,0 +1,61 @@
+import random
+import unittest
+
+import maze
+from a_star import search
+from a_star.hierarchical import HierarchicalPlanner
+from enums import State
+from models import Dimensions, Grid
+
+
+# HPA* only promises near-optimal paths, so answers are checked for reachability, valid steps, an
+# honest cost and never beating the shortest path. Grids at most one cluster wide have a single
+# column of clusters, where vertically stacked clusters once had their borders built as if they
+# sat side by side.
+class HierarchicalPlannerTest(unittest.TestCase):
+    WIDTHS = (5, 9, 15, HierarchicalPlanner.CLUSTER_SIZE, 40)
+    SEEDS = range(6)
+    QUERIES = 6
+    EDITS = 20
+
+    def test_paths_match_full_search(self) -> None:
+        for width in self.WIDTHS:
+            for diagonals in (False, True):
+                for seed in self.SEEDS:
+                    with self.subTest(width=width, diagonals=diagonals, seed=seed):
+                        self._check(width, diagonals, seed)
+
+    def _check(self, width: int, diagonals: bool, seed: int) -> None:
+        rng = random.Random(seed)
+        random.seed(seed)
+        m = maze.Maze(width, rng.randrange(20, 70))
+        m.generate(Dimensions(1, 1), diagonals, seed, maze.get_generator('caves'))
+        planner = HierarchicalPlanner(m.grid)
+        try:
+            self._query(m.grid, planner, rng)
+            for _ in range(self.EDITS):
+                index = rng.randrange(m.grid.size)
+                m.grid.set_state(index, State.WALL if m.grid.is_passable(index) else State.OPEN)
+            self._query(m.grid, planner, rng)
+        finally:
+            planner.close()
+
+    def _query(self, grid: Grid, planner: HierarchicalPlanner, rng: random.Random) -> None:
+        opened = [index for index in range(grid.size) if grid.is_passable(index)]
+        for _ in range(self.QUERIES):
+            start, goal = rng.choice(opened), rng.choice(opened)
+            result = planner.search(start, goal)
+            expected = search(grid, start, goal)
+            self.assertEqual(result.found, expected.found)
+            if not expected.found:
+                continue
+
+            self.assertEqual((result.path[0], result.path[-1]), (start, goal))
+            for a, b in zip(result.path, result.path[1:]):
+                self.assertIn(b, grid.passable_neighbors(a))
+            self.assertAlmostEqual(result.cost, grid.path_cost(result.path), places=9)
+            self.assertGreaterEqual(result.cost, expected.cost - 1e-9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import random
+import unittest
+
+import maze
+from a_star import search
+from a_star.incremental import IncrementalPlanner
+from enums import State
+from models import Dimensions
+
+
+# Replays random wall edits and checks every repaired answer against a search from scratch. With
+# diagonals, float ties between keys once ended repairs early and left path extraction looping.
+class IncrementalPlannerTest(unittest.TestCase):
+    # Includes the seeds that used to loop (82 and 231 on wilson)
+    SEEDS = range(240)
+    EDITS = 8
+
+    def test_repairs_match_full_search(self) -> None:
+        for seed in self.SEEDS:
+            for name in ('wilson', 'caves'):
+                with self.subTest(seed=seed, generator=name):
+                    self._replay(seed, name)
+
+    def _replay(self, seed: int, name: str) -> None:
+        rng = random.Random(seed)
+        random.seed(seed)
+        m = maze.Maze(rng.randrange(7, 16), rng.randrange(7, 16))
+        m.generate(Dimensions(1, 1), True, seed, maze.get_generator(name))
+        grid = m.grid
+        opened = [index for index in range(grid.size) if grid.is_passable(index)]
+        if len(opened) < 2:
+            return
+
+        start, goal = rng.sample(opened, 2)
+        planner = IncrementalPlanner(grid)
+        try:
+            for _ in range(self.EDITS):
+                result = planner.search(start, goal)
+                expected = search(grid, start, goal)
+                self.assertEqual(result.found, expected.found)
+                if expected.found:
+                    self.assertAlmostEqual(result.cost, expected.cost, places=9)
+                    self.assertAlmostEqual(grid.path_cost(result.path), expected.cost, places=9)
+                    self.assertEqual((result.path[0], result.path[-1]), (start, goal))
+
+                index = rng.randrange(grid.size)
+                if index not in (start, goal):
+                    grid.set_state(index, State.WALL if grid.is_passable(index) else State.OPEN)
+        finally:
+            planner.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+from a_star import search
+from enums import State
+from maze import MappedGrid, MazeHeader, save_grid, stream_maze
+from maze.eller import Eller
+from models import Grid
+
+
+# Files written from a grid in memory or streamed row by row must map back to the same cells.
+# Widths either side of a byte boundary and odd and even heights exercise the row padding and
+# Eller's closing row.
+class StorageTest(unittest.TestCase):
+    SIZES = ((1, 1), (7, 5), (8, 8), (9, 12), (16, 3), (17, 17), (30, 21))
+
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._directory.name, 'maze.bin')
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def test_save_grid_round_trip(self) -> None:
+        for seed, (width, height) in enumerate(self.SIZES):
+            for diagonals in (False, True):
+                with self.subTest(width=width, height=height, diagonals=diagonals):
+                    rng = random.Random(seed)
+                    grid = Grid(width, height, diagonals)
+                    grid.write_states(bytearray((State.OPEN if rng.random() < 0.6 else State.WALL).value \
+                                                for _ in range(grid.size)))
+                    header = save_grid(self.path, grid, seed)
+                    self._check(header, MazeHeader(width, height, diagonals, seed), grid.passable_mask())
+
+    def test_stream_maze_round_trip(self) -> None:
+        for seed, (width, height) in enumerate(self.SIZES):
+            for diagonals in (False, True):
+                with self.subTest(width=width, height=height, diagonals=diagonals):
+                    header = stream_maze(self.path, width, height, diagonals, seed)
+                    carved = Eller().carve(width, height, diagonals, random.Random(seed))
+                    self.assertEqual(len(carved), width * height)
+                    self._check(header, MazeHeader(width, height, diagonals, seed), \
+                                np.frombuffer(carved, dtype=np.uint8) != 0)
+
+    def _check(self, header: MazeHeader, expected: MazeHeader, opened: np.ndarray) -> None:
+        self.assertEqual(header, expected)
+        self.assertEqual(os.path.getsize(self.path), expected.file_size)
+        with MappedGrid(self.path) as mapped:
+            self.assertEqual(mapped.header, expected)
+            self.assertEqual((mapped.width, mapped.height, mapped.diagonals), \
+                             (expected.width, expected.height, expected.diagonals))
+
+            # Bit x & 7 of byte x >> 3 in row y is cell (x, y); the padding past the width stays clear.
+            # rows() is a view of the mapping, which cannot be closed while it is held.
+            bits = np.unpackbits(mapped.rows(), axis=1, bitorder='little')
+            self.assertEqual(bits.shape, (expected.height, expected.row_bytes * 8))
+            np.testing.assert_array_equal(bits[:, :expected.width].astype(np.bool_).ravel(), opened)
+            self.assertFalse(bits[:, expected.width:].any())
+
+            np.testing.assert_array_equal(mapped.passable_mask(), opened)
+            self.assertEqual([mapped.is_passable(index) for index in range(mapped.size)], opened.tolist())
+
+            states = mapped.unpack_states()
+            self.assertEqual(bytes(states), bytes((State.OPEN if cell else State.WALL).value for cell in opened))
+
+            # A search over the mapped file agrees with one over the same cells held in memory
+            grid = Grid(mapped.width, mapped.height, mapped.diagonals, states=states)
+            cells = np.flatnonzero(opened)
+            if len(cells):
+                start, goal = int(cells[0]), int(cells[-1])
+                self.assertAlmostEqual(search(mapped, start, goal).cost, search(grid, start, goal).cost, places=9)
+
+
+if __name__ == '__main__':
+    unittest.main()